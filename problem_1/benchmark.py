@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from graphdb import GraphDB
+
+# benchmark harness for the graphdb package on synthetic people/company/event graphs.
+#   python benchmark.py --sizes 1000 10000 100000 --output results.json
+#   python benchmark.py --compare baseline.json results.json
+#   python benchmark.py --cold-start --budget-ms 300
+# every measurement is one json record (operation, size, seconds, peak memory), so results of different
+# commits can be compared with --compare
+
+EVENT_COUNTRIES = ['USA', 'Germany', 'UK', 'Japan', 'France', 'India', 'Brazil', 'Canada']
+INDUSTRIES = ['Technology', 'Energy', 'Finance', 'Healthcare', 'Biotech', 'Retail', 'Manufacturing']
+RELATIONS = ['Sponsor', 'Attendee', 'Exhibitor', 'Keynote Speaker']
+SENIORITIES = ['Junior', 'Mid-level', 'Senior', 'Director', 'VP', 'C-level']
+DEPARTMENTS = ['Engineering', 'Marketing', 'Sales', 'HR', 'Operations', 'Finance']
+
+
+# pareto distributed popularity weights: a few hubs, a long tail
+def _power_law_weights(rng, n, exponent):
+    weights = rng.pareto(exponent, n) + 1.0
+    return weights / weights.sum()
+
+
+def _pick(rng, values, n):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+# synthetic dataframes with the schema of the demo in run_demo.py, about n_nodes nodes in total
+# (5% events, 15% companies, 80% people). employees per company and events per company follow power laws,
+# the same seed always gives the same frames
+def generate_graph_frames(n_nodes, seed=0):
+    rng = np.random.default_rng(seed)
+    n_events = max(n_nodes // 20, 1)
+    n_companies = max(n_nodes * 3 // 20, 1)
+    n_people = max(n_nodes - n_events - n_companies, 1)
+
+    event_urls = np.array([f"event{i}.com" for i in range(n_events)], dtype=object)
+    company_urls = np.array([f"company{i}.com" for i in range(n_companies)], dtype=object)
+    start_dates = np.datetime64('2024-01-01') + rng.integers(0, 3 * 365, n_events)
+
+    events = pd.DataFrame({
+        'event_url': event_urls,
+        'event_name': [f"Event {i}" for i in range(n_events)],
+        'event_start_date': start_dates.astype(str),
+        'event_country': _pick(rng, EVENT_COUNTRIES, n_events),
+        'event_industry': _pick(rng, INDUSTRIES, n_events),
+    })
+    companies = pd.DataFrame({
+        'company_url': company_urls,
+        'company_name': [f"Company {i}" for i in range(n_companies)],
+        'company_industry': _pick(rng, INDUSTRIES, n_companies),
+        'company_revenue': rng.integers(1, 10000, n_companies),
+        'company_country': _pick(rng, EVENT_COUNTRIES, n_companies),
+    })
+    contact_info = pd.DataFrame({
+        'company_url': company_urls,
+        'office_city': _pick(rng, ['San Francisco', 'Berlin', 'New York', 'Tokyo', 'London'], n_companies),
+        'office_email': [f"info@company{i}.com" for i in range(n_companies)],
+    })
+
+    # events per company ~ zipf, events picked by popularity, duplicates dropped
+    events_per_company = np.minimum(rng.zipf(2.0, n_companies), n_events)
+    attendees = pd.DataFrame({
+        'company_url': np.repeat(company_urls, events_per_company),
+        'event_url': event_urls[rng.choice(n_events, events_per_company.sum(), p=_power_law_weights(rng, n_events, 1.5))],
+    }).drop_duplicates(['company_url', 'event_url'], ignore_index=True)
+    attendees['company_relation_to_event'] = _pick(rng, RELATIONS, len(attendees))
+
+    # employer of every person picked by company popularity
+    employees = pd.DataFrame({
+        'company_url': company_urls[rng.choice(n_companies, n_people, p=_power_law_weights(rng, n_companies, 1.2))],
+        'person_id': np.arange(n_people),
+        'person_seniority': _pick(rng, SENIORITIES, n_people),
+        'person_department': _pick(rng, DEPARTMENTS, n_people),
+    })
+
+    return {
+        'events': events,
+        'companies': companies,
+        'attendees': attendees,
+        'contact_info': contact_info,
+        'employees': employees,
+    }
+
+
+# runs fn repeat times, returns the best time and, with track_memory, the peak of python allocations
+# during one extra traced run
+def measure(fn, repeat=3, track_memory=True):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def _result_size(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def build_graph(frames):
+    graph = GraphDB(cache_size=0)
+    steps = [
+        ('df_to_graph_insert_at_node[events]', lambda: graph.df_to_graph_insert_at_node(frames['events'], 'event_url', 'event')),
+        ('df_to_graph_insert_at_node[companies]', lambda: graph.df_to_graph_insert_at_node(frames['companies'], 'company_url', 'company')),
+        ('df_to_graph_insert_as_edge[attends]', lambda: graph.df_to_graph_insert_as_edge(frames['attendees'], 'company_url', 'company', 'event_url', 'event', 'attends')),
+        ('df_to_graph_insert_at_node[contact_info]', lambda: graph.df_to_graph_insert_at_node(frames['contact_info'], 'company_url', 'company')),
+        ('df_to_graph_insert_as_edge[works_at]', lambda: graph.df_to_graph_insert_as_edge(frames['employees'], 'person_id', 'people', 'company_url', 'company', 'works_at')),
+    ]
+    return graph, steps
+
+
+# filter workload, the same operations for GraphDB and CompactGraphDB
+def query_workload(graph, frames):
+    full_set = set(graph.nodes)
+    company_sample = set(frames['companies']['company_url'].iloc[::10])
+    hub_company = frames['employees']['company_url'].value_counts().index[0]
+    return [
+        ('filter_by_node_conditions_for_set[equality]', lambda: graph.filter_by_node_conditions_for_set(full_set, 'event', {'event_country': 'USA'})),
+        ('filter_by_node_conditions_for_set[range]', lambda: graph.filter_by_node_conditions_for_set(full_set, 'event', {'event_start_date': ('between', '2025-07-01', '2025-12-31')})),
+        ('filter_by_edge_conditions_single_node[hub]', lambda: graph.filter_by_edge_conditions_single_node('people', 'works_at', {}, hub_company)),
+        ('filter_by_edge_conditions_for_set[10% companies]', lambda: graph.filter_by_edge_conditions_for_set('people', 'works_at', {'person_seniority': 'Junior'}, company_sample)),
+        ('filter_node_set_global_filterer[event]', lambda: graph.filter_node_set_global_filterer('event', {'event_country': 'USA'}, full_set)),
+        ('filter_node_set_global_filterer[company]', lambda: graph.filter_node_set_global_filterer('company', {'company_industry': 'Finance'}, full_set)),
+        ('filter_edge_set_global_filterer[sponsors]', lambda: graph.filter_edge_set_global_filterer('company', 'event', 'attends', {'company_relation_to_event': 'Sponsor'}, full_set)),
+        ('query_path', lambda: graph.query_path('people -works_at{person_seniority=Junior}-> company{industry=Finance} -attends-> event{industry=Technology}')),
+    ]
+
+
+# the node filterer cases with a two hop expansion, run with and without the reachability index
+def reachability_workload(graph, frames):
+    full_set = set(graph.nodes)
+    popular_event = frames['attendees']['event_url'].value_counts().index[0]
+    return [
+        ('filter_node_set_global_filterer[event, reachability]', lambda: graph.filter_node_set_global_filterer('event', {'event_country': 'USA'}, full_set)),
+        ('filter_node_set_global_filterer[people, reachability]', lambda: graph.filter_node_set_global_filterer('people', {}, full_set)),
+        ('people_of_event[popular]', lambda: graph.reachability.people_of_event(popular_event)),
+    ]
+
+
+def run_benchmark(n_nodes, seed=0, repeat=3, track_memory=True):
+    records = []
+
+    def record(operation, backend, seconds, peak, result=None):
+        records.append({
+            'operation': operation,
+            'backend': backend,
+            'n_nodes': n_nodes,
+            'seconds': seconds,
+            'peak_bytes': peak,
+            'result_size': _result_size(result),
+        })
+
+    start = time.perf_counter()
+    frames = generate_graph_frames(n_nodes, seed)
+    record('generate_graph_frames', None, time.perf_counter() - start, None)
+
+    # ingestion: timed on an untraced build, peak memory taken from a second, traced build
+    graph, steps = build_graph(frames)
+    for operation, step in steps:
+        stats = step()
+        record(operation, 'GraphDB', stats['seconds'], None)
+        records[-1]['rows_per_second'] = stats['rows_per_second']
+    if track_memory:
+        ingestion_records = records[-len(steps):]
+        _, traced_steps = build_graph(frames)
+        tracemalloc.start()
+        for ingestion_record, (_, step) in zip(ingestion_records, traced_steps):
+            tracemalloc.reset_peak()
+            step()
+            ingestion_record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    for operation, fn in query_workload(graph, frames):
+        seconds, peak, result = measure(fn, repeat, track_memory)
+        record(operation, 'GraphDB', seconds, peak, result)
+
+    # global filterers answering the second hop from the reachability index
+    seconds, peak, index = measure(graph.enable_reachability, 1, track_memory)
+    record('enable_reachability', 'GraphDB', seconds, peak)
+    records[-1]['index_bytes'] = index.memory_info()['bytes']
+    for operation, fn in reachability_workload(graph, frames):
+        seconds, peak, result = measure(fn, repeat, track_memory)
+        record(operation, 'GraphDB', seconds, peak, result)
+    graph.disable_reachability()
+
+    seconds, peak, compact = measure(graph.to_compact, 1, track_memory)
+    record('to_compact', 'CompactGraphDB', seconds, peak)
+    compact.query_cache = None
+    for operation, fn in query_workload(compact, frames):
+        seconds, peak, result = measure(fn, repeat, track_memory)
+        record(operation, 'CompactGraphDB', seconds, peak, result)
+    return records
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# import time of the engine in fresh interpreters, so nothing is already in sys.modules. the child times
+# only the import statement, interpreter startup is not counted
+COLD_START_STATEMENT = 'from graphdb import GraphDB'
+
+
+def cold_start(runs=7, statement=COLD_START_STATEMENT):
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=cwd).stdout
+        timings.append(float(output) * 1000)
+    return {
+        'statement': statement,
+        'runs': runs,
+        'median_ms': float(np.median(timings)),
+        'min_ms': min(timings),
+        'max_ms': max(timings),
+    }
+
+
+def run_suite(sizes, seed=0, repeat=3, track_memory=True):
+    records = []
+    for n_nodes in sizes:
+        records.extend(run_benchmark(n_nodes, seed, repeat, track_memory))
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        # ru_maxrss is kilobytes on linux, bytes on macOS
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'records': records,
+    }
+
+
+# time ratio new/old for every operation measured in both result files
+def compare(old_results, new_results):
+    key = lambda record: (record['operation'], record['backend'], record['n_nodes'])
+    old_records = {key(record): record for record in old_results['records']}
+    rows = []
+    for record in new_results['records']:
+        old = old_records.get(key(record))
+        if old is None or not old['seconds']:
+            continue
+        rows.append({
+            'operation': record['operation'],
+            'backend': record['backend'],
+            'n_nodes': record['n_nodes'],
+            'old_seconds': old['seconds'],
+            'new_seconds': record['seconds'],
+            'ratio': record['seconds'] / old['seconds'],
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="graphdb benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="number of nodes of the synthetic graphs (10^3 .. 10^7)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per query, the best time is kept")
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc peak memory measurements (faster on large graphs)")
+    parser.add_argument('--output', help="write the results as json to this file instead of stdout")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files")
+    parser.add_argument('--cold-start', action='store_true', help="only measure the import time of the engine in fresh interpreters")
+    parser.add_argument('--budget-ms', type=float, default=300, help="with --cold-start, exit with status 1 when the median import time is above this")
+    args = parser.parse_args(argv)
+
+    if args.cold_start:
+        result = cold_start(max(args.repeat, 5))
+        result['budget_ms'] = args.budget_ms
+        print(json.dumps(result, indent=2))
+        if result['median_ms'] > args.budget_ms:
+            sys.exit(1)
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old_results = json.load(f)
+        with open(args.compare[1]) as f:
+            new_results = json.load(f)
+        print(compare(old_results, new_results).to_string(index=False))
+        return
+
+    results = run_suite(args.sizes, args.seed, args.repeat, not args.no_memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
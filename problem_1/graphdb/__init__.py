@@ -0,0 +1,33 @@
+# graph engine package. importing the package does no work: the names below are resolved on first
+# access, so worker processes that only need graphdb.parallel never load the engine itself
+import importlib
+
+_EXPORTS = {
+    'Node': 'graph',
+    'Edge': 'graph',
+    'GraphDB': 'graph',
+    'CompactGraphDB': 'graph',
+    'EDGE_SCHEMA': 'graph',
+    'NodeSet': 'nodeset',
+    'CSRStore': 'csr_store',
+    'QueryCache': 'query_cache',
+    'ReachabilityIndex': 'reachability',
+    'Profiler': 'profiling',
+    'QueryStep': 'profiling',
+    'json_lines_exporter': 'profiling',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'graphdb' has no attribute {name!r}")
+    value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+    # cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,142 @@
+import bisect
+import datetime
+
+import numpy as np
+
+# node and edge conditions map an attribute to either a plain value (equality, as before) or an operator tuple:
+#   ('>=', value), ('<=', value), ('between', low, high), ('in', [values]), ('prefix', text), ('==', value)
+# ranges are inclusive. ranges only match values of the same kind as the bound: numbers with numbers,
+# strings with strings (ISO dates such as '2025-07-01' compare correctly as strings), datetimes with datetimes
+# (date, datetime, pandas Timestamp and np.datetime64 compare with each other, see datetime_key)
+
+OPERATORS = {'==', '>=', '<=', 'between', 'in', 'prefix'}
+
+
+def parse_condition(condition):
+    if isinstance(condition, tuple) and condition and isinstance(condition[0], str) and condition[0] in OPERATORS:
+        operator, args = condition[0], condition[1:]
+        expected = {'between': 2, 'in': 1}.get(operator, 1)
+        if len(args) != expected:
+            raise ValueError(f"Condition {condition} expects {expected} argument(s)")
+        if operator == 'prefix' and not isinstance(args[0], str):
+            raise ValueError(f"Condition {condition} expects a string prefix")
+        return operator, args
+    return '==', (condition,)
+
+
+def value_kind(value):
+    if isinstance(value, (bool, np.bool_)):
+        return 'other'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return 'number'
+    if isinstance(value, str):
+        return 'str'
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return 'datetime'
+    return 'other'
+
+
+# np.datetime64 in microseconds of a date, datetime, Timestamp or np.datetime64, so all of them order
+# together: a date is its midnight, timezone aware datetimes are compared in UTC. NaT stays NaT
+def datetime_key(value):
+    # pandas NaT is a datetime numpy can't convert
+    if value != value:
+        return np.datetime64('NaT', 'us')
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[us]')
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, 'us')
+    return np.datetime64(value, 'D').astype('datetime64[us]')
+
+
+# value in the order of its kind
+def order_key(value, kind):
+    return datetime_key(value) if kind == 'datetime' else value
+
+
+# bounds (low, high) of a range operator, None for an open side
+def range_bounds(operator, args):
+    if operator == '>=':
+        return args[0], None
+    if operator == '<=':
+        return None, args[0]
+    if operator == 'between':
+        return args[0], args[1]
+    return None
+
+
+def range_kind(operator, args):
+    return value_kind(next(bound for bound in range_bounds(operator, args) if bound is not None))
+
+
+# smallest string greater than every string starting with prefix
+def prefix_upper_bound(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else None
+
+
+def matches(value, condition):
+    operator, args = parse_condition(condition)
+    if operator == '==':
+        return value == args[0]
+    if operator == 'in':
+        return value in args[0]
+    if operator == 'prefix':
+        return isinstance(value, str) and value.startswith(args[0])
+    low, high = range_bounds(operator, args)
+    kind = value_kind(value)
+    if kind != range_kind(operator, args):
+        return False
+    if kind == 'datetime':
+        value, low, high = (datetime_key(v) if v is not None else None for v in (value, low, high))
+    try:
+        return (low is None or value >= low) and (high is None or value <= high)
+    except TypeError:
+        # 'other' values without an order between them
+        return False
+
+
+# all conditions hold on the attributes dict, a missing attribute never matches
+def attributes_match(attributes, conditions):
+    for attribute, condition in conditions.items():
+        if attribute not in attributes or not matches(attributes[attribute], condition):
+            return False
+    return True
+
+
+# distinct values of one attribute in sorted order, split by kind so numbers and strings never get compared.
+# answers range and prefix conditions with bisect in O(log distinct values). values of no ordered kind
+# ('other') are kept unsorted and checked one by one with matches
+class SortedValues:
+    def __init__(self, values):
+        self.by_kind = {}
+        for value in values:
+            # NaN is unordered and breaks bisect, it never matches a range or prefix anyway
+            if value != value:
+                continue
+            self.by_kind.setdefault(value_kind(value), []).append(value)
+        # bisect runs on keys: the values themselves, datetime_key for datetimes
+        self.keys = {}
+        for kind, kind_values in self.by_kind.items():
+            if kind != 'other':
+                kind_values.sort(key=lambda value: order_key(value, kind))
+                self.keys[kind] = [order_key(value, kind) for value in kind_values] if kind == 'datetime' else kind_values
+
+    # distinct values matching a range or prefix condition
+    def select(self, operator, args):
+        if operator == 'prefix':
+            values = self.by_kind.get('str', [])
+            start = bisect.bisect_left(values, args[0])
+            upper = prefix_upper_bound(args[0])
+            end = bisect.bisect_left(values, upper) if upper is not None else len(values)
+            return values[start:end]
+        kind = range_kind(operator, args)
+        values = self.by_kind.get(kind, [])
+        if kind == 'other':
+            return [value for value in values if matches(value, (operator, *args))]
+        keys = self.keys[kind] if values else []
+        low, high = (order_key(bound, kind) if bound is not None else None for bound in range_bounds(operator, args))
+        start = bisect.bisect_left(keys, low) if low is not None else 0
+        end = bisect.bisect_right(keys, high) if high is not None else len(keys)
+        return values[start:end]
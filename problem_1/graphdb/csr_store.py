@@ -0,0 +1,623 @@
+import datetime
+import json
+import numpy as np
+
+from .conditions import datetime_key, parse_condition, matches, range_bounds, range_kind, prefix_upper_bound
+
+NODE_TYPES = ['people', 'company', 'event']
+
+# edge directions seen from the node a traversal starts at, and the adjacency sides they read.
+# 'out' follows edges from their source to their target, 'in' from their target back to their source
+DIRECTIONS = {'out': ('out',), 'in': ('in',), 'both': ('out', 'in')}
+
+
+# smallest signed integer type able to hold codes 0..n_categories-1 and the missing marker -1
+def code_dtype(n_categories):
+    if n_categories < np.iinfo(np.int8).max:
+        return np.int8
+    if n_categories < np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+# categories as a numpy array. numbers get a numeric dtype, everything else stays as python objects
+def categories_array(values):
+    if values and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        return np.array(values, dtype=np.int64)
+    if values and all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in values):
+        return np.array(values, dtype=np.float64)
+    categories = np.empty(len(values), dtype=object)
+    # one by one, so list and tuple values stay single values instead of becoming array dimensions
+    for i, value in enumerate(values):
+        categories[i] = value
+    return categories
+
+
+# dictionary encoded column: row i holds categories[codes[i]], code -1 means the row has no value.
+# low cardinality fields (event_country, person_seniority, ...) cost a single byte per row
+class Column:
+    def __init__(self, categories, codes):
+        # categories may be an EncodedValues read from a snapshot, decoded on first use
+        self._categories = categories
+        self.codes = codes
+        self._lookup = None
+        self._counts = None
+        self._kind = None
+        self._sorted_rows = None
+
+    @classmethod
+    def from_values(cls, n_rows, rows, values):
+        # NaN (v != v) is stored as a missing value: it has no place in the sorted categories and never matches
+        present = [(row, value) for row, value in zip(rows, values) if value == value]
+        if len(present) < len(values):
+            rows = [row for row, _ in present]
+            values = [value for _, value in present]
+        try:
+            unique_values = list(dict.fromkeys(values))
+        except TypeError:
+            # unhashable values (e.g. list-valued tags) are told apart by type and repr and stay unsorted,
+            # conditions on them are checked value by value (kind 'other')
+            keys = [(type(value), repr(value)) for value in values]
+            unique_values = list(dict(zip(keys, values)).values())
+            lookup = {(type(value), repr(value)): code for code, value in enumerate(unique_values)}
+            value_codes = [lookup[key] for key in keys]
+        else:
+            # sorted categories keep value order and code order identical when the values are comparable
+            try:
+                unique_values.sort()
+            except TypeError:
+                pass
+            lookup = {value: code for code, value in enumerate(unique_values)}
+            value_codes = [lookup[value] for value in values]
+        codes = np.full(n_rows, -1, dtype=code_dtype(len(unique_values)))
+        if rows:
+            codes[np.asarray(rows, dtype=np.int64)] = value_codes
+        return cls(categories_array(unique_values), codes)
+
+    @property
+    def categories(self):
+        if isinstance(self._categories, EncodedValues):
+            self._categories = self._categories.to_array()
+        return self._categories
+
+    # code of value, -1 if the value never occurs in the column
+    def code_of(self, value):
+        if self._lookup is None:
+            try:
+                self._lookup = {value: code for code, value in enumerate(self.categories.tolist())}
+            except TypeError:
+                # unhashable categories, compared one by one
+                self._lookup = False
+        if self._lookup is False:
+            return next((code for code, category in enumerate(self.categories.tolist()) if category == value), -1)
+        try:
+            return self._lookup.get(value, -1)
+        except TypeError:
+            return -1
+
+    # number of rows holding the value of every code
+    def counts(self):
+        if self._counts is None:
+            self._counts = np.bincount(self.codes[self.codes >= 0].astype(np.int64), minlength=len(self.categories))
+        return self._counts
+
+    # 'number' / 'str' when the categories are sorted values of one kind (so code order is value order), else 'other'
+    def kind(self):
+        if self._kind is None:
+            categories = self.categories
+            if categories.dtype != object:
+                self._kind = 'number'
+            elif len(categories) and all(isinstance(value, str) for value in categories.tolist()):
+                self._kind = 'str'
+            else:
+                self._kind = 'other'
+        return self._kind
+
+    # codes matching a condition: (low, high) code range for ranges and prefixes on a sorted column,
+    # else an array of codes
+    def match_codes(self, condition):
+        operator, args = parse_condition(condition)
+        if operator == '==':
+            code = self.code_of(args[0])
+            return np.array([code] if code >= 0 else [], dtype=np.int64)
+        if operator == 'in':
+            codes = [self.code_of(value) for value in args[0]]
+            return np.array(sorted({code for code in codes if code >= 0}), dtype=np.int64)
+        kind = self.kind()
+        if kind == 'other':
+            return np.array([code for code, value in enumerate(self.categories.tolist()) if matches(value, condition)], dtype=np.int64)
+        if operator == 'prefix':
+            if kind != 'str':
+                return (0, 0)
+            upper = prefix_upper_bound(args[0])
+            return (int(np.searchsorted(self.categories, args[0], side='left')),
+                    int(np.searchsorted(self.categories, upper, side='left')) if upper is not None else len(self.categories))
+        if range_kind(operator, args) != kind:
+            return (0, 0)
+        low, high = range_bounds(operator, args)
+        return (int(np.searchsorted(self.categories, low, side='left')) if low is not None else 0,
+                int(np.searchsorted(self.categories, high, side='right')) if high is not None else len(self.categories))
+
+    # boolean mask of the rows whose code matches (result of match_codes)
+    def mask(self, rows, match):
+        codes = self.codes[rows]
+        if isinstance(match, tuple):
+            return (codes >= match[0]) & (codes < match[1])
+        if len(match) == 1:
+            return codes == match[0]
+        return np.isin(codes, match)
+
+    def count(self, match):
+        counts = self.counts()
+        if isinstance(match, tuple):
+            return int(counts[match[0]:match[1]].sum())
+        return int(counts[match].sum())
+
+    # rows whose code matches, through the rows sorted by code: O(log rows) plus the size of the result
+    def matching_rows(self, match):
+        if self._sorted_rows is None:
+            order = np.argsort(self.codes, kind='stable')
+            self._sorted_rows = (order, self.codes[order])
+        order, sorted_codes = self._sorted_rows
+        ranges = [match] if isinstance(match, tuple) else [(code, code + 1) for code in match.tolist()]
+        slices = [order[np.searchsorted(sorted_codes, low, side='left'):np.searchsorted(sorted_codes, high, side='left')]
+                  for low, high in ranges if high > low]
+        return np.sort(np.concatenate(slices)) if slices else np.zeros(0, dtype=np.int64)
+
+    def has_value(self, row):
+        return self.codes[row] >= 0
+
+    def value_at(self, row):
+        value = self.categories[self.codes[row]]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def nbytes(self):
+        return self.codes.nbytes + self.categories.nbytes
+
+
+# read-only graph storage: node ids interned to integers, adjacency as CSR arrays per edge label and direction,
+# node attributes column-wise per node_type and edge attributes column-wise per edge label.
+# every method works on integer node indices (numpy arrays), GraphDB-style ids only go in and out
+# through index_of / indices_of / ids
+class CSRStore:
+    # local_rows and adjacency are derived from the other arrays, snapshots pass them in to skip the rebuild
+    def __init__(self, ids, node_types, node_columns, edge_endpoints, edge_columns, local_rows=None, adjacency=None):
+        self.ids = ids
+        self._index = None
+        self._type_members = {}
+        self.node_types = node_types
+
+        # row of every node inside the attribute table of its node_type
+        if local_rows is None:
+            local_rows = np.zeros(len(ids), dtype=np.int64)
+            for type_code in range(len(NODE_TYPES)):
+                members = np.flatnonzero(node_types == type_code)
+                local_rows[members] = np.arange(len(members))
+        self.local_rows = local_rows
+        self.node_columns = node_columns
+
+        # edge_endpoints: label -> (source indices, target indices), position in the arrays is the edge id
+        self.edge_endpoints = edge_endpoints
+        self.edge_columns = edge_columns
+        if adjacency is None:
+            adjacency = {label: self._build_csr(node1, node2) for label, (node1, node2) in edge_endpoints.items()}
+        self.adjacency = adjacency
+
+    # node id -> integer index, built on first use so that loading a snapshot does not decode every id
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {node_id: i for i, node_id in enumerate(self.ids)}
+        return self._index
+
+    @classmethod
+    def from_graph(cls, graph):
+        ids = list(graph.nodes)
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        node_types = np.zeros(len(ids), dtype=np.int8)
+        type_row_counts = [0] * len(NODE_TYPES)
+        node_values = {node_type: {} for node_type in NODE_TYPES}
+        edge_values = {}
+
+        for i, node in enumerate(graph.nodes.values()):
+            type_code = NODE_TYPES.index(node.node_type)
+            node_types[i] = type_code
+            row = type_row_counts[type_code]
+            type_row_counts[type_code] += 1
+            for attribute, value in node.attributes.items():
+                rows, values = node_values[node.node_type].setdefault(attribute, ([], []))
+                rows.append(row)
+                values.append(value)
+
+            # every edge is taken from its source node only
+            for neighbours in node.out_adjacency.values():
+                for edge in neighbours.values():
+                    sources, targets, attributes = edge_values.setdefault(edge.label, ([], [], {}))
+                    edge_id = len(sources)
+                    sources.append(i)
+                    targets.append(index[edge.target.node_id])
+                    for attribute, value in edge.attributes.items():
+                        rows, values = attributes.setdefault(attribute, ([], []))
+                        rows.append(edge_id)
+                        values.append(value)
+
+        node_columns = {
+            node_type: {attribute: Column.from_values(type_row_counts[NODE_TYPES.index(node_type)], rows, values)
+                        for attribute, (rows, values) in columns.items()}
+            for node_type, columns in node_values.items()
+        }
+        edge_endpoints = {}
+        edge_columns = {}
+        for label, (sources, targets, attributes) in edge_values.items():
+            edge_endpoints[label] = (np.asarray(sources, dtype=np.int32), np.asarray(targets, dtype=np.int32))
+            edge_columns[label] = {attribute: Column.from_values(len(sources), rows, values)
+                                   for attribute, (rows, values) in attributes.items()}
+
+        return cls(ids, node_types, node_columns, edge_endpoints, edge_columns)
+
+    # CSR arrays of one label per direction: 'out' lists every edge under its source, 'in' under its target
+    def _build_csr(self, sources, targets):
+        edge_ids = np.arange(len(sources), dtype=np.int32)
+        return {'out': self._csr(sources, targets, edge_ids), 'in': self._csr(targets, sources, edge_ids)}
+
+    def _csr(self, starts, ends, edge_ids):
+        order = np.argsort(starts, kind='stable')
+        offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(starts, minlength=len(self.ids)), out=offsets[1:])
+        return offsets, ends[order], edge_ids[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, node_id):
+        return self.index.get(node_id, -1)
+
+    # indices of the ids known to the store, unknown ids are dropped
+    def indices_of(self, node_ids):
+        index = self.index
+        return np.fromiter((index[node_id] for node_id in node_ids if node_id in index), dtype=np.int64)
+
+    def node_type_of(self, i):
+        return NODE_TYPES[self.node_types[i]]
+
+    def node_attributes(self, i):
+        row = self.local_rows[i]
+        return {attribute: column.value_at(row)
+                for attribute, column in self.node_columns[self.node_type_of(i)].items()
+                if column.has_value(row)}
+
+    def edge_attributes(self, label, edge_id):
+        return {attribute: column.value_at(edge_id)
+                for attribute, column in self.edge_columns[label].items()
+                if column.has_value(edge_id)}
+
+    def nodes_of_type(self, node_type):
+        if node_type not in self._type_members:
+            self._type_members[node_type] = np.flatnonzero(self.node_types == NODE_TYPES.index(node_type))
+        return self._type_members[node_type]
+
+    def edge_count(self, edge_label):
+        return len(self.edge_endpoints[edge_label][0]) if edge_label in self.edge_endpoints else 0
+
+    def _node_match(self, node_type, attribute, condition):
+        column = self.node_columns[node_type].get(attribute)
+        if column is None:
+            return None, np.zeros(0, dtype=np.int64)
+        return column, column.match_codes(condition)
+
+    # number of nodes of node_type matching the rarest of the node_conditions
+    def estimate_cardinality(self, node_type, node_conditions):
+        if not node_conditions:
+            return len(self.nodes_of_type(node_type))
+        estimate = None
+        for attribute, condition in node_conditions.items():
+            column, match = self._node_match(node_type, attribute, condition)
+            count = column.count(match) if column is not None else 0
+            estimate = count if estimate is None else min(estimate, count)
+        return estimate
+
+    # candidates (node indices) of node_type whose attributes match all the conditions
+    def filter_nodes(self, candidates, node_type, node_conditions):
+        candidates = candidates[self.node_types[candidates] == NODE_TYPES.index(node_type)]
+        for attribute, condition in node_conditions.items():
+            if len(candidates) == 0:
+                break
+            column, match = self._node_match(node_type, attribute, condition)
+            if column is None:
+                return candidates[:0]
+            candidates = candidates[column.mask(self.local_rows[candidates], match)]
+        return candidates
+
+    # all nodes of node_type matching the conditions, starting from the sorted rows of the most selective
+    # condition instead of scanning the whole type
+    def select_nodes(self, node_type, node_conditions):
+        column_matches = [self._node_match(node_type, attribute, condition) for attribute, condition in node_conditions.items()]
+        if any(column is None for column, _ in column_matches):
+            return np.zeros(0, dtype=np.int64)
+        column, match = min(column_matches, key=lambda column_match: column_match[0].count(column_match[1]))
+        candidates = self.nodes_of_type(node_type)[column.matching_rows(match)]
+        return self.filter_nodes(candidates, node_type, node_conditions)
+
+    # number of edges of label at the seeds in the given direction, all neighbour types included
+    def degree(self, seeds, edge_label, direction='both'):
+        if edge_label not in self.adjacency:
+            return 0
+        seeds = np.asarray(seeds, dtype=np.int64)
+        total = 0
+        for side in DIRECTIONS[direction]:
+            offsets = self.adjacency[edge_label][side][0]
+            total += int((offsets[seeds + 1] - offsets[seeds]).sum())
+        return total
+
+    # neighbours of type node_out_type reached from the seeds over edges of label satisfying edge_conditions,
+    # following the edges in the given direction ('out', 'in' or 'both', see DIRECTIONS).
+    # returns one entry per matching edge, so the same neighbour can appear several times
+    def neighbours(self, seeds, edge_label, node_out_type, edge_conditions, direction='both'):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown edge direction: {direction}")
+        if edge_label not in self.adjacency:
+            return np.zeros(0, dtype=np.int64)
+        seeds = np.asarray(seeds, dtype=np.int64)
+
+        found_parts = []
+        edge_id_parts = []
+        for side in DIRECTIONS[direction]:
+            offsets, ends, edge_ids = self.adjacency[edge_label][side]
+            # positions of all the CSR slices of the seeds, without a python loop over the seeds
+            starts = offsets[seeds]
+            lengths = offsets[seeds + 1] - starts
+            before = np.cumsum(lengths) - lengths
+            positions = np.repeat(starts - before, lengths) + np.arange(lengths.sum())
+            found_parts.append(ends[positions])
+            edge_id_parts.append(edge_ids[positions])
+        found = np.concatenate(found_parts) if len(found_parts) > 1 else found_parts[0]
+        edge_ids = np.concatenate(edge_id_parts) if len(edge_id_parts) > 1 else edge_id_parts[0]
+
+        keep = self.node_types[found] == NODE_TYPES.index(node_out_type)
+        columns = self.edge_columns[edge_label]
+        for attribute, condition in (edge_conditions or {}).items():
+            column = columns.get(attribute)
+            if column is None:
+                return np.zeros(0, dtype=np.int64)
+            keep &= column.mask(edge_ids, column.match_codes(condition))
+        return found[keep].astype(np.int64)
+
+    # approximate memory taken by the arrays (ids and their dictionary not included)
+    def nbytes(self):
+        total = self.node_types.nbytes + self.local_rows.nbytes
+        for columns in list(self.node_columns.values()) + list(self.edge_columns.values()):
+            total += sum(column.nbytes() for column in columns.values())
+        for label, sides in self.adjacency.items():
+            total += sum(array.nbytes for arrays in sides.values() for array in arrays)
+            total += sum(array.nbytes for array in self.edge_endpoints[label])
+        return total
+
+    def save(self, path):
+        write_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        return read_snapshot(path, mmap)
+
+
+# snapshot file format:
+#   SNAPSHOT_MAGIC | header length (uint64, little endian) | json header | arrays
+# every array starts at a multiple of SNAPSHOT_ALIGNMENT, so a memory mapped file can be viewed as numpy
+# arrays without copying. the header lists the arrays (dtype, shape, offset) and how the node ids, the
+# node/edge attribute columns and the per-label, per-direction adjacency are built from them.
+# python values (ids, categories) are stored either as a numeric array or as utf-8 bytes + offsets.
+# version 1 files (undirected adjacency) are still read, their adjacency is rebuilt from the edge endpoints
+
+SNAPSHOT_MAGIC = b'GDBSNAP2'
+SNAPSHOT_MAGIC_V1 = b'GDBSNAP1'
+SNAPSHOT_ALIGNMENT = 64
+
+
+# python value of a numpy scalar, datetimes (np.datetime64 and pandas Timestamp) as datetime.datetime
+def _python_value(value):
+    if isinstance(value, np.datetime64) or (_is_datetime(value) and type(value) is not datetime.datetime):
+        if value != value:
+            return None
+        return datetime_key(value).item()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _is_datetime(value):
+    return isinstance(value, datetime.datetime) and value.tzinfo is None
+
+
+def _is_date(value):
+    return isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)
+
+
+# json form of a value of the 'json' kind. json objects only appear as the tagged forms of the python types
+# json has no type for, so tuples (e.g. tuple node ids), dicts, datetimes and dates come back as they were.
+# other types can't be stored
+def _to_json(value):
+    value = _python_value(value)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, tuple):
+        return {'tuple': [_to_json(item) for item in value]}
+    if isinstance(value, dict):
+        return {'dict': [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if _is_datetime(value):
+        return {'datetime': value.isoformat()}
+    if _is_date(value):
+        return {'date': value.isoformat()}
+    if isinstance(value, datetime.datetime):
+        raise ValueError(f"Timezone aware datetimes can't be stored in a snapshot, convert them to naive UTC: {value!r}")
+    raise ValueError(f"Values of type {type(value).__name__} can't be stored in a snapshot: {value!r}")
+
+
+def _from_json(tagged):
+    if 'tuple' in tagged:
+        return tuple(tagged['tuple'])
+    if 'dict' in tagged:
+        return {key: item for key, item in tagged['dict']}
+    if 'datetime' in tagged:
+        return datetime.datetime.fromisoformat(tagged['datetime'])
+    return datetime.date.fromisoformat(tagged['date'])
+
+
+# kinds of EncodedValues stored as one array of values
+ARRAY_KINDS = ('int64', 'float64', 'datetime64', 'date64')
+
+
+# a list of python values stored in arrays, decoded item by item on access
+class EncodedValues:
+    def __init__(self, kind, arrays):
+        # kind: 'int64' / 'float64' / 'datetime64' / 'date64' (arrays: [values]), 'str' / 'json' (arrays: [utf-8 data, offsets]).
+        # datetimes (datetime, Timestamp, np.datetime64) are stored in microseconds and decoded as datetime.datetime
+        self.kind = kind
+        self.arrays = arrays
+
+    @classmethod
+    def encode(cls, values):
+        values = [_python_value(value) for value in values]
+        if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+            return cls('int64', [np.array(values, dtype=np.int64)])
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            return cls('float64', [np.array(values, dtype=np.float64)])
+        if values and all(_is_datetime(value) for value in values):
+            return cls('datetime64', [np.array(values, dtype='datetime64[us]')])
+        if values and all(_is_date(value) for value in values):
+            return cls('date64', [np.array(values, dtype='datetime64[D]')])
+        if all(isinstance(value, str) for value in values):
+            kind, texts = 'str', values
+        else:
+            # mixed types (e.g. integer person ids next to url ids) and lists / tuples, see _to_json
+            kind, texts = 'json', [json.dumps(_to_json(value)) for value in values]
+        encoded = [text.encode('utf-8') for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        return cls(kind, [np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets])
+
+    def __len__(self):
+        return len(self.arrays[0]) if self.kind in ARRAY_KINDS else len(self.arrays[1]) - 1
+
+    def __getitem__(self, i):
+        if self.kind in ARRAY_KINDS:
+            return self.arrays[0][i].item()
+        data, offsets = self.arrays
+        text = bytes(data[offsets[i]:offsets[i + 1]]).decode('utf-8')
+        return text if self.kind == 'str' else json.loads(text, object_hook=_from_json)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_array(self):
+        if self.kind in ('int64', 'float64'):
+            return self.arrays[0]
+        return categories_array(list(self))
+
+
+def _values_header(name, values, arrays):
+    encoded = values if isinstance(values, EncodedValues) else EncodedValues.encode(list(values))
+    names = []
+    for position, array in enumerate(encoded.arrays):
+        arrays[f"{name}.{position}"] = array
+        names.append(f"{name}.{position}")
+    return {'kind': encoded.kind, 'arrays': names}
+
+
+def _column_header(name, column, arrays):
+    arrays[f"{name}.codes"] = column.codes
+    return {'codes': f"{name}.codes", 'categories': _values_header(f"{name}.categories", column._categories, arrays)}
+
+
+def write_snapshot(store, path):
+    arrays = {}
+    header = {
+        'ids': _values_header('ids', store.ids, arrays),
+        'node_types': 'node_types',
+        'local_rows': 'local_rows',
+        'node_columns': {},
+        'edges': {},
+    }
+    arrays['node_types'] = store.node_types
+    arrays['local_rows'] = store.local_rows
+    for node_type, columns in store.node_columns.items():
+        header['node_columns'][node_type] = {
+            attribute: _column_header(f"node.{node_type}.{attribute}", column, arrays) for attribute, column in columns.items()
+        }
+    for label, (sources, targets) in store.edge_endpoints.items():
+        prefix = f"edge.{label}"
+        arrays[f"{prefix}.sources"], arrays[f"{prefix}.targets"] = sources, targets
+        adjacency = {}
+        for side, side_arrays in store.adjacency[label].items():
+            names = [f"{prefix}.{side}.offsets", f"{prefix}.{side}.ends", f"{prefix}.{side}.edge_ids"]
+            for name, array in zip(names, side_arrays):
+                arrays[name] = array
+            adjacency[side] = names
+        header['edges'][label] = {
+            'endpoints': [f"{prefix}.sources", f"{prefix}.targets"],
+            'adjacency': adjacency,
+            'columns': {attribute: _column_header(f"{prefix}.{attribute}", column, arrays)
+                        for attribute, column in store.edge_columns[label].items()},
+        }
+
+    # array layout, offsets relative to the start of the data section
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': position}
+        position += -(-array.nbytes // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+    header['arrays'] = layout
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = -(-(len(SNAPSHOT_MAGIC) + 8 + len(header_bytes)) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+    with open(path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.uint64(len(header_bytes)).astype('<u8').tobytes())
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + position)
+
+
+# with mmap=True the arrays are read-only views on the memory mapped file: loading only parses the header,
+# pages are read on first access and shared between all processes mapping the same file
+def read_snapshot(path, mmap=True):
+    with open(path, 'rb') as f:
+        magic = f.read(len(SNAPSHOT_MAGIC))
+        if magic not in (SNAPSHOT_MAGIC, SNAPSHOT_MAGIC_V1):
+            raise ValueError(f"{path} is not a graph snapshot")
+        header_length = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        header = json.loads(f.read(header_length).decode('utf-8'))
+        data_start = -(-(len(SNAPSHOT_MAGIC) + 8 + header_length) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+        if mmap:
+            buffer = np.memmap(f, dtype=np.uint8, mode='r')
+        else:
+            f.seek(0)
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    def array(name):
+        spec = header['arrays'][name]
+        dtype = np.dtype(spec['dtype'])
+        start = data_start + spec['offset']
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        return buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+    def values(spec):
+        return EncodedValues(spec['kind'], [array(name) for name in spec['arrays']])
+
+    def column(spec):
+        return Column(values(spec['categories']), array(spec['codes']))
+
+    node_columns = {node_type: {attribute: column(spec) for attribute, spec in columns.items()}
+                    for node_type, columns in header['node_columns'].items()}
+    edge_endpoints = {label: tuple(array(name) for name in spec['endpoints']) for label, spec in header['edges'].items()}
+    adjacency = None
+    if magic == SNAPSHOT_MAGIC:
+        adjacency = {label: {side: tuple(array(name) for name in names) for side, names in spec['adjacency'].items()}
+                     for label, spec in header['edges'].items()}
+    edge_columns = {label: {attribute: column(column_spec) for attribute, column_spec in spec['columns'].items()}
+                    for label, spec in header['edges'].items()}
+    return CSRStore(values(header['ids']), array(header['node_types']), node_columns, edge_endpoints, edge_columns,
+                    local_rows=array(header['local_rows']), adjacency=adjacency)
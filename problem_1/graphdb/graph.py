@@ -0,0 +1,1031 @@
+import itertools
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+import numpy as np
+from .csr_store import CSRStore, DIRECTIONS
+from .nodeset import NodeSet
+from .conditions import SortedValues, attributes_match, matches, parse_condition
+from .query_cache import QueryCache, cached_query
+from .reachability import ReachabilityIndex
+from .profiling import Profiler, explain, profiled
+from . import path_query
+
+# source and target node types of the edge labels of the schema, used by the global filterers to follow
+# every hop in the direction the edges are stored in: people -works_at-> company -attends-> event
+EDGE_SCHEMA = {'works_at': ('people', 'company'), 'attends': ('company', 'event')}
+
+# (node type, edge label) hops of filter_node_set_global_filterer from the filtered nodes per filtering_node_type,
+# and whether the hops are chained (the second hop starts from the nodes of the first one)
+GLOBAL_FILTERER_HOPS = {
+    'event': ([('company', 'attends'), ('people', 'works_at')], True),
+    'people': ([('company', 'works_at'), ('event', 'attends')], True),
+    'company': ([('people', 'works_at'), ('event', 'attends')], False),
+}
+
+# streams of filter_page kept open between pages, the least recently used ones are dropped beyond this
+MAX_PAGE_STREAMS = 64
+
+
+# estimated result sizes of the profiled filters (see profiling.py), from the planner statistics
+def _estimate_node_filter(graph, node_set, node_type, node_conditions):
+    return min(len(node_set), graph.estimate_cardinality(node_type, node_conditions or {}))
+
+
+# seeds times the average degree of the seed side of the label, at most all the nodes of node_out_type
+def _estimate_hop(graph, node_out_type, edge_label, n_seeds):
+    source_type, target_type = EDGE_SCHEMA.get(edge_label, (node_out_type, node_out_type))
+    seed_type = source_type if node_out_type == target_type else target_type
+    return min(round(n_seeds * graph.average_degree(edge_label, seed_type)), graph.estimate_cardinality(node_out_type, {}))
+
+
+def _estimate_edge_filter(graph, node_out_type, edge_label, edge_conditions, node_set, direction='both'):
+    return _estimate_hop(graph, node_out_type, edge_label, len(node_set))
+
+
+def _estimate_single_node_edge_filter(graph, node_out_type, edge_label, edge_conditions, node_in_id, direction='both'):
+    return _estimate_hop(graph, node_out_type, edge_label, 1)
+
+
+def _estimate_node_set_global_filterer(graph, filtering_node_type, filtering_node_attributes, nodes_set_in):
+    if filtering_node_type not in GLOBAL_FILTERER_HOPS:
+        return None
+    hops, chained = GLOBAL_FILTERER_HOPS[filtering_node_type]
+    matched = _estimate_node_filter(graph, nodes_set_in, filtering_node_type, filtering_node_attributes)
+    total = matched
+    reached = matched
+    for hop_type, hop_label in hops:
+        hop_estimate = _estimate_hop(graph, hop_type, hop_label, reached if chained else matched)
+        total += hop_estimate
+        reached = hop_estimate
+    return min(total, len(nodes_set_in))
+
+
+def _estimate_edge_set_global_filterer(graph, filtering_node_source_type, filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set_in):
+    reached = sum(min(_estimate_hop(graph, node_type, filtering_edge_label, len(node_set_in)), len(node_set_in))
+                  for node_type in (filtering_node_source_type, filtering_node_target_type))
+    remaining = [(node_type, label) for node_type, label in (('people', 'works_at'), ('event', 'attends'))
+                 if node_type not in (filtering_node_source_type, filtering_node_target_type)]
+    if len(remaining) == 1:
+        reached += _estimate_hop(graph, remaining[0][0], remaining[0][1], reached)
+    return reached
+
+
+class Node:
+    def __init__(self, node_id, node_type):
+        if node_type not in ['people', 'company', 'event']:
+            raise ValueError("Node type must be 'people', 'company', or 'event'")
+        self.node_id = node_id
+        self.node_type = node_type
+        self.attributes = {}
+        # dense integer id, position of the node in GraphDB.node_ids, used by NodeSet
+        self.index = None
+        # outgoing (node is the source) and incoming (node is the target) edges, both partitioned by
+        # (label, neighbour type) and keyed by neighbour id, so finding a specific edge is a dict hit and
+        # traversal only sees the requested label and direction
+        self.out_adjacency = {}
+        self.in_adjacency = {}
+
+    def add_attribute(self, attribute, value):
+        self.attributes[attribute] = value
+
+    # an edge is outgoing on its source and incoming on its target (both, for a self edge)
+    def add_edge(self, edge):
+        if edge.source is self:
+            self.out_adjacency.setdefault((edge.label, edge.target.node_type), {})[edge.target.node_id] = edge
+        if edge.target is self:
+            self.in_adjacency.setdefault((edge.label, edge.source.node_type), {})[edge.source.node_id] = edge
+
+    def _adjacencies(self, direction):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown edge direction: {direction}")
+        return [self.out_adjacency if side == 'out' else self.in_adjacency for side in DIRECTIONS[direction]]
+
+    # edge of given label to (direction='out') or from (direction='in') the neighbour, None if there is none
+    def get_edge(self, label, neighbour_type, neighbour_id, direction='out'):
+        for adjacency in self._adjacencies(direction):
+            edge = adjacency.get((label, neighbour_type), {}).get(neighbour_id)
+            if edge is not None:
+                return edge
+        return None
+
+    # (neighbour id, edge) pairs of the edges with label to/from neighbours of neighbour_type.
+    # with direction='both' a neighbour connected in both directions appears once per edge
+    def neighbours(self, label, neighbour_type, direction='both'):
+        for adjacency in self._adjacencies(direction):
+            yield from adjacency.get((label, neighbour_type), {}).items()
+
+    # all edges of the node, regardless of label and direction
+    @property
+    def edges(self):
+        outgoing = [edge for neighbours in self.out_adjacency.values() for edge in neighbours.values()]
+        # self edges are already listed as outgoing
+        incoming = [edge for neighbours in self.in_adjacency.values() for edge in neighbours.values() if edge.source is not self]
+        return outgoing + incoming
+
+    def __repr__(self):
+        return f"Node({self.node_id}, {self.node_type}, {self.attributes})"
+
+
+# directed edge from source to target
+class Edge:
+    def __init__(self, source, target, label):
+        self.nodes = (source, target)
+        self.label = label
+        self.attributes = {}
+
+    @property
+    def source(self):
+        return self.nodes[0]
+
+    @property
+    def target(self):
+        return self.nodes[1]
+
+    def add_attribute(self, attribute, value):
+        self.attributes[attribute] = value
+
+    def __repr__(self):
+        return f"Edge({self.nodes[0].node_id} --[{self.label}]--> {self.nodes[1].node_id}, {self.attributes})"
+
+
+class GraphDB:
+    # cache_size: number of global filterer results kept in the LRU result cache, 0 disables it
+    def __init__(self, cache_size=128):
+        self.nodes = {}
+        # bumped by every modification, invalidates the cached query results
+        self.version = 0
+        self.query_cache = QueryCache(cache_size) if cache_size else None
+        # ParallelEdgeFilter when parallel set filtering is enabled, see enable_parallel
+        self.parallel = None
+        # ReachabilityIndex of people <-> events when enabled, see enable_reachability
+        self.reachability = None
+        # Profiler recording filter calls when profiling is enabled, see enable_profiling
+        self.profiler = None
+        # secondary hash index: (node_type, attribute) -> {value: set of node ids}
+        # maintained by add_node_attribute so equality filters only touch matching nodes
+        self.attribute_index = {}
+        # (node_type, attribute) pairs holding unhashable values (e.g. lists): not in attribute_index,
+        # conditions on them scan the nodes of the type
+        self.unindexed_attributes = set()
+        # sorted distinct values per (node_type, attribute) for range/prefix conditions, built on first use
+        # and dropped when the set of distinct values of the attribute changes
+        self._sorted_values = {}
+        # cardinality statistics for the path query planner: node ids per node_type, edge count per label
+        self.node_type_index = {}
+        self.edge_counts = {}
+        # dense integer ids for NodeSet bitsets: node_ids[node.index] == node.node_id
+        self.node_ids = []
+        self._type_node_sets = {}
+        # open streams of filter_page by cursor id: (iter_method_name, offset, stream, first node of the next page)
+        self._page_streams = OrderedDict()
+        self._page_stream_ids = itertools.count()
+
+    def add_node(self, node_id, node_type):
+        if node_id in self.nodes:
+            raise ValueError("Node ID already exists")
+        node = Node(node_id, node_type)
+        self.version += 1
+        node.index = len(self.node_ids)
+        self.nodes[node_id] = node
+        self.node_ids.append(node_id)
+        self.node_type_index.setdefault(node_type, set()).add(node_id)
+        return node
+
+    # NodeSet bitset of the given node ids, ids not in the graph are dropped
+    def node_set(self, node_ids):
+        nodes = self.nodes
+        indices = [nodes[node_id].index for node_id in node_ids if node_id in nodes]
+        return NodeSet.from_indices(indices, len(self.node_ids))
+
+    def node_set_ids(self, node_set):
+        return {self.node_ids[i] for i in node_set}
+
+    def node_set_nodes(self, node_set):
+        return [self.nodes[self.node_ids[i]] for i in node_set]
+
+    # NodeSet of all nodes of node_type, rebuilt only when nodes were added since the last call
+    def type_node_set(self, node_type):
+        cached = self._type_node_sets.get(node_type)
+        if cached is None or cached[0] != len(self.node_ids):
+            cached = (len(self.node_ids), self.node_set(self.nodes_of_type(node_type)))
+            self._type_node_sets[node_type] = cached
+        return cached[1]
+
+    def _as_node_set(self, node_set):
+        return node_set if isinstance(node_set, NodeSet) else self.node_set(node_set)
+
+    # directed edge node1 -> node2, stored as outgoing on node1 and incoming on node2. the reverse edge
+    # node2 -> node1 with the same label is a different edge (e.g. a person reviews a company and the
+    # company reviews the person)
+    def add_edge(self, node1_id, node2_id, label):
+        if node1_id not in self.nodes or node2_id not in self.nodes:
+            raise ValueError("Both nodes must exist in the graph")
+        node1 = self.nodes[node1_id]
+        node2 = self.nodes[node2_id]
+        if node1.get_edge(label, node2.node_type, node2_id, 'out') is not None:
+            raise ValueError("Edge already exists")
+        edge = Edge(node1, node2, label)
+        self.version += 1
+        node1.add_edge(edge)
+        node2.add_edge(edge)
+        self.edge_counts[label] = self.edge_counts.get(label, 0) + 1
+        if self.reachability is not None:
+            self.reachability.edge_added(edge)
+        return edge
+
+    def add_node_attribute(self, node_id, attribute, value):
+        if node_id not in self.nodes:
+            raise ValueError("Node does not exist")
+        self._set_node_attribute(self.nodes[node_id], attribute, value)
+
+    # sets the attribute and keeps attribute_index in sync, caller guarantees the node exists
+    def _set_node_attribute(self, node, attribute, value):
+        self.version += 1
+        key = (node.node_type, attribute)
+        postings = self.attribute_index.setdefault(key, {})
+        if key not in self.unindexed_attributes:
+            try:
+                hash(value)
+            except TypeError:
+                # the values of the attribute can't all be dict keys, the attribute is no longer indexed
+                self.unindexed_attributes.add(key)
+                postings.clear()
+                self._sorted_values.pop(key, None)
+        if key in self.unindexed_attributes:
+            node.add_attribute(attribute, value)
+            return
+
+        # overwriting an attribute: drop the node from the posting list of the old value
+        if attribute in node.attributes:
+            old_postings = postings.get(node.attributes[attribute])
+            if old_postings is not None:
+                old_postings.discard(node.node_id)
+                if not old_postings:
+                    del postings[node.attributes[attribute]]
+                    self._sorted_values.pop((node.node_type, attribute), None)
+
+        node.add_attribute(attribute, value)
+        if value not in postings:
+            postings[value] = set()
+            self._sorted_values.pop((node.node_type, attribute), None)
+        postings[value].add(node.node_id)
+
+    # ids of nodes of node_type whose attribute equals value, straight from the index
+    def lookup_node_attribute(self, node_type, attribute, value):
+        if (node_type, attribute) in self.unindexed_attributes:
+            return self._scan_node_condition(node_type, attribute, ('==', value))
+        return self.attribute_index.get((node_type, attribute), {}).get(value, set())
+
+    # posting lists of all the values of the attribute matching the condition (see conditions.py).
+    # ranges and prefixes bisect the sorted distinct values, so only matching values are touched
+    def _condition_postings(self, node_type, attribute, condition):
+        if (node_type, attribute) in self.unindexed_attributes:
+            return [self._scan_node_condition(node_type, attribute, condition)]
+        operator, args = parse_condition(condition)
+        postings = self.attribute_index.get((node_type, attribute), {})
+        if operator == '==':
+            values = [args[0]]
+        elif operator == 'in':
+            values = set(args[0])
+        else:
+            sorted_values = self._sorted_values.get((node_type, attribute))
+            if sorted_values is None:
+                sorted_values = SortedValues(postings)
+                self._sorted_values[(node_type, attribute)] = sorted_values
+            values = sorted_values.select(operator, args)
+        return [postings[value] for value in values if value in postings]
+
+    # ids of nodes of node_type whose attribute matches the condition, checked node by node
+    def _scan_node_condition(self, node_type, attribute, condition):
+        nodes = self.nodes
+        return {node_id for node_id in self.nodes_of_type(node_type)
+                if attribute in nodes[node_id].attributes and matches(nodes[node_id].attributes[attribute], condition)}
+
+    # ids of nodes of node_type whose attribute matches the condition (a value or an operator tuple)
+    def lookup_node_condition(self, node_type, attribute, condition):
+        postings = self._condition_postings(node_type, attribute, condition)
+        if len(postings) == 1:
+            return postings[0]
+        return set().union(*postings)
+
+    def count_node_condition(self, node_type, attribute, condition):
+        return sum(len(posting) for posting in self._condition_postings(node_type, attribute, condition))
+
+    def add_edge_attribute(self, node1_id, node2_id, label, attribute, value):
+        if node1_id not in self.nodes or node2_id not in self.nodes:
+            raise ValueError("Edge does not exist")
+        edge = self.nodes[node1_id].get_edge(label, self.nodes[node2_id].node_type, node2_id, 'out')
+        if edge is None:
+            raise ValueError("Edge does not exist")
+        self.version += 1
+        edge.add_attribute(attribute, value)
+
+    @profiled(estimate=_estimate_node_filter)
+    def filter_by_node_conditions_for_set(self, node_set, node_type, node_conditions):
+        result_set = []
+        if not node_conditions:
+            return node_set
+
+        # index path: intersect the posting lists (smallest first) with the input set,
+        # nodes that do not match the conditions are never looked at
+        postings = [self.lookup_node_condition(node_type, attribute, condition) for attribute, condition in node_conditions.items()]
+        postings.sort(key=len)
+        if self.profiler is not None:
+            self.profiler.count('nodes_scanned', len(postings[0]))
+
+        # NodeSet in, NodeSet out: the intersected posting lists are checked against the bitset word by word
+        if isinstance(node_set, NodeSet):
+            matching_ids = set(postings[0])
+            for posting in postings[1:]:
+                matching_ids &= posting
+            indices = np.fromiter((self.nodes[node_id].index for node_id in matching_ids), dtype=np.int64, count=len(matching_ids))
+            return NodeSet.from_indices(indices[node_set.contains_many(indices)], len(self.node_ids))
+
+        if not isinstance(node_set, (set, frozenset)):
+            node_set = set(node_set)
+
+        matching_ids = postings[0] & node_set
+        for posting in postings[1:]:
+            if not matching_ids:
+                break
+            matching_ids &= posting
+
+        for node_id in matching_ids:
+            result_set.append(self.nodes[node_id])
+
+        return result_set
+
+    def nodes_of_type(self, node_type):
+        return self.node_type_index.get(node_type, set())
+
+    def node_attribute_names(self, node_type):
+        return {attribute for attribute_type, attribute in self.attribute_index if attribute_type == node_type}
+
+    # estimated number of nodes of node_type matching node_conditions: size of the smallest posting list
+    def estimate_cardinality(self, node_type, node_conditions):
+        if not node_conditions:
+            return len(self.nodes_of_type(node_type))
+        return min(self.count_node_condition(node_type, attribute, condition) for attribute, condition in node_conditions.items())
+
+    # average number of edges of edge_label per node of node_type
+    def average_degree(self, edge_label, node_type):
+        return self.edge_counts.get(edge_label, 0) / max(len(self.nodes_of_type(node_type)), 1)
+
+    # declarative multi-hop query, e.g. "people -works_at-> company{industry=Finance} -attends-> event{industry=Technology}".
+    # returns the nodes of the first step, see path_query.py
+    @profiled()
+    def query_path(self, path):
+        return path_query.query_path(self, path)
+
+    def plan_path(self, path):
+        return path_query.plan_path(self, path)
+
+    # reference implementation of the above, scanning every node of the input set. ids not in the graph are skipped
+    @profiled(estimate=_estimate_node_filter)
+    def filter_by_node_conditions_for_set_scan(self, node_set, node_type, node_conditions):
+        result_set = []
+        if not node_conditions:
+            return node_set
+        if self.profiler is not None:
+            self.profiler.count('nodes_scanned', len(node_set))
+
+        for node_id in node_set:
+            # like the index path, ids not in the graph match no condition
+            if node_id not in self.nodes:
+                continue
+
+            node_in = self.nodes[node_id]
+            meets_conditions = True
+            if node_in.node_type != node_type:
+                meets_conditions = False
+
+            for condition, value in node_conditions.items():
+                if condition not in node_in.attributes:
+                    meets_conditions = False
+                    break
+                if not matches(node_in.attributes[condition], value):
+                    meets_conditions = False
+                    break
+
+            if meets_conditions:
+                result_set.append(node_in)
+
+        return result_set
+
+    # for a SINGLE node_in, return: 
+    #   all nodes of a type
+    #   connecting to node_in via edges with label and conditions specified
+    # direction: 'out' follows the edges node_in -> node, 'in' the edges node -> node_in, 'both' either
+    @profiled(estimate=_estimate_single_node_edge_filter, nested=False)
+    def filter_by_edge_conditions_single_node(self, node_out_type, edge_label, edge_conditions, node_in_id, direction='both'):
+        if node_in_id not in self.nodes:
+            raise ValueError("Node does not exist")
+
+        node_in = self.nodes[node_in_id]
+        result = []
+        if self.profiler is not None:
+            self.profiler.count(f"edges_visited[{edge_label}]", sum(len(adjacency.get((edge_label, node_out_type), ())) for adjacency in node_in._adjacencies(direction)))
+        # a neighbour connected in both directions is only returned once
+        seen = set() if direction == 'both' else None
+
+        # only the edges with the requested label and direction towards nodes of node_out_type are visited
+        for neighbour_id, edge in node_in.neighbours(edge_label, node_out_type, direction):
+            # if no edge conditions then need to only check for correct label
+            if edge_conditions and not attributes_match(edge.attributes, edge_conditions):
+                continue
+            if seen is not None:
+                if neighbour_id in seen:
+                    continue
+                seen.add(neighbour_id)
+            result.append(self.nodes[neighbour_id])
+
+        return result
+
+    @profiled(estimate=_estimate_edge_filter)
+    def filter_by_edge_conditions_for_set(self, node_out_type, edge_label, edge_conditions, node_set, direction='both'):
+        if self.parallel is not None and self.parallel.should_run(len(node_set)):
+            return self._filter_by_edge_conditions_parallel(node_out_type, edge_label, edge_conditions, node_set, direction)
+
+        if isinstance(node_set, NodeSet):
+            result_indices = []
+            for i in node_set:
+                for node in self.filter_by_edge_conditions_single_node(node_out_type, edge_label, edge_conditions, self.node_ids[i], direction):
+                    result_indices.append(node.index)
+            return NodeSet.from_indices(result_indices, len(self.node_ids))
+
+        result_set = set()
+
+        for node_id in node_set:
+            if node_id not in self.nodes:
+                raise ValueError(f"Node {node_id} does not exist")
+
+            filtered_nodes = self.filter_by_edge_conditions_single_node(node_out_type, edge_label, edge_conditions, node_id, direction)
+            for node in filtered_nodes:
+                result_set.add(node)
+
+        return list(result_set)   
+
+    # nodes_set_in can be a set of node ids (returns a list of nodes) or a NodeSet (returns a NodeSet).
+    # internally every step works on NodeSet bitsets. results are cached until the graph is modified
+    @profiled(estimate=_estimate_node_set_global_filterer)
+    @cached_query
+    def filter_node_set_global_filterer(self, filtering_node_type, filtering_node_attributes, nodes_set_in):
+        node_set_in = self._as_node_set(nodes_set_in)
+
+        # add nodes of original type filtering_node_type by filtering simply on node attributes:
+        if filtering_node_attributes:
+            nodes_original_type = self.filter_by_node_conditions_for_set(node_set_in, filtering_node_type, filtering_node_attributes)
+        else:
+            nodes_original_type = node_set_in & self.type_node_set(filtering_node_type)
+
+        # add nodes for other types by edge based filtering
+        empty_conditions = set()
+
+        # case: event => find all companies attending the subset of events && find all people working in those companies
+        # (people are read from the reachability index when it is enabled)
+        if filtering_node_type == 'event':
+            nodes_new_type_company = self._filter_schema_hop('company', 'attends', empty_conditions, nodes_original_type)
+            if self.reachability is not None:
+                nodes_new_type_people = self.reachability.people_of_events(nodes_original_type)
+            else:
+                nodes_new_type_people  = self._filter_schema_hop('people', 'works_at', empty_conditions, nodes_new_type_company)
+            nodes_new_type = nodes_new_type_company | nodes_new_type_people
+
+        # case: people => find all companies people work at && find all events those companies attending
+        elif filtering_node_type == 'people':
+            nodes_new_type_company = self._filter_schema_hop('company', 'works_at', empty_conditions, nodes_original_type)
+            if self.reachability is not None:
+                nodes_new_type_event = self.reachability.events_of_people(nodes_original_type)
+            else:
+                nodes_new_type_event = self._filter_schema_hop('event', 'attends', empty_conditions, nodes_new_type_company)
+            nodes_new_type = nodes_new_type_company | nodes_new_type_event
+
+        #case: company => find all people working there and all events it is attending
+        elif filtering_node_type == 'company':
+            nodes_new_type_people = self._filter_schema_hop('people', 'works_at', empty_conditions, nodes_original_type)
+            nodes_new_type_event = self._filter_schema_hop('event', 'attends',  empty_conditions, nodes_original_type)
+            nodes_new_type = nodes_new_type_people | nodes_new_type_event
+
+        else:
+            raise ValueError(f"Unknown filtering_node_type: {filtering_node_type}")
+
+        result_filtered = (nodes_original_type | nodes_new_type) & node_set_in
+        if isinstance(nodes_set_in, NodeSet):
+            return result_filtered
+        return self.node_set_nodes(result_filtered)
+
+    # node_set_in can be a set of node ids (returns a set of nodes) or a NodeSet (returns a NodeSet).
+    # internally every step works on NodeSet bitsets. results are cached until the graph is modified
+    @profiled(estimate=_estimate_edge_set_global_filterer)
+    @cached_query
+    def filter_edge_set_global_filterer(self, filtering_node_source_type, filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set_in):
+        filtering_node_combined_type = {filtering_node_source_type, filtering_node_target_type}
+        if 'company' not in filtering_node_combined_type:
+            raise ValueError(f"can not filter edges between people and events for the current schema")
+        
+        elif 'people' not in filtering_node_combined_type:
+            filtering_node_remaining_type = 'people'
+            remaining_edge_label = 'works_at'
+        
+        elif 'event' not in filtering_node_combined_type:
+            filtering_node_remaining_type = 'event'
+            remaining_edge_label = 'attends'
+        
+        else:
+            raise ValueError(f"illegal type")
+
+        node_set = self._as_node_set(node_set_in)
+
+        # nodes of src type with edge drawing to set
+        filtered_nodes_src = self._filter_schema_hop(filtering_node_source_type, filtering_edge_label, filtering_edge_conditions, node_set) & node_set
+
+        # nodes of tgt type with edge drawing to set
+        filtered_nodes_tgt = self._filter_schema_hop(filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set) & node_set
+        filtered_nodes_total = filtered_nodes_src | filtered_nodes_tgt
+
+        # remaining nodes
+        empty_conditions = {}
+        filtered_nodes_remaining = self._filter_schema_hop(filtering_node_remaining_type, remaining_edge_label, empty_conditions, filtered_nodes_total)
+
+        filtered_nodes_total = filtered_nodes_total | filtered_nodes_remaining
+        if isinstance(node_set_in, NodeSet):
+            return filtered_nodes_total
+        return set(self.node_set_nodes(filtered_nodes_total))
+
+    # direction of a hop over edge_label reaching nodes of node_out_type according to EDGE_SCHEMA:
+    # 'out' towards the target type, 'in' towards the source type, 'both' for labels outside the schema
+    # or between nodes of the same type
+    def _schema_direction(self, edge_label, node_out_type):
+        source_type, target_type = EDGE_SCHEMA.get(edge_label, (None, None))
+        if source_type == target_type:
+            return 'both'
+        if node_out_type == target_type:
+            return 'out'
+        if node_out_type == source_type:
+            return 'in'
+        return 'both'
+
+    def _filter_schema_hop(self, node_out_type, edge_label, edge_conditions, node_set):
+        return self.filter_by_edge_conditions_for_set(node_out_type, edge_label, edge_conditions, node_set, self._schema_direction(edge_label, node_out_type))
+
+    # streaming variants of the filters: generators yielding nodes as the traversal finds them, so a caller
+    # asking for the first N results stops the traversal after N nodes. limit=None yields everything.
+    # the order is stable as long as the graph (version) and the input set do not change, see filter_page
+
+    # nodes of node_type in node_set matching node_conditions. without conditions all nodes of node_type in node_set
+    def iter_by_node_conditions_for_set(self, node_set, node_type, node_conditions, limit=None):
+        return self._limited(self._iter_by_node_conditions_for_set(node_set, node_type, node_conditions), limit)
+
+    def _iter_by_node_conditions_for_set(self, node_set, node_type, node_conditions):
+        contains = self._membership(node_set)
+        if not node_conditions:
+            for node_id in self._iter_ids(node_set):
+                node = self.nodes.get(node_id)
+                if node is not None and node.node_type == node_type:
+                    yield node
+            return
+
+        postings = [self.lookup_node_condition(node_type, attribute, condition) for attribute, condition in node_conditions.items()]
+        postings.sort(key=len)
+        for node_id in postings[0]:
+            if all(node_id in posting for posting in postings[1:]):
+                node = self.nodes[node_id]
+                if contains(node):
+                    yield node
+
+    def iter_by_edge_conditions_single_node(self, node_out_type, edge_label, edge_conditions, node_in_id, limit=None, direction='both'):
+        return self._limited(self._iter_by_edge_conditions_single_node(node_out_type, edge_label, edge_conditions, node_in_id, direction), limit)
+
+    def _iter_by_edge_conditions_single_node(self, node_out_type, edge_label, edge_conditions, node_in_id, direction='both'):
+        if node_in_id not in self.nodes:
+            raise ValueError("Node does not exist")
+        seen = set() if direction == 'both' else None
+        for neighbour_id, edge in self.nodes[node_in_id].neighbours(edge_label, node_out_type, direction):
+            if edge_conditions and not attributes_match(edge.attributes, edge_conditions):
+                continue
+            if seen is not None:
+                if neighbour_id in seen:
+                    continue
+                seen.add(neighbour_id)
+            yield self.nodes[neighbour_id]
+
+    def iter_by_edge_conditions_for_set(self, node_out_type, edge_label, edge_conditions, node_set, limit=None, direction='both'):
+        return self._limited(self._iter_by_edge_conditions_for_set(node_out_type, edge_label, edge_conditions, node_set, direction), limit)
+
+    def _iter_by_edge_conditions_for_set(self, node_out_type, edge_label, edge_conditions, node_set, direction='both'):
+        seen = set()
+        for node_id in self._iter_ids(node_set):
+            for node in self._iter_by_edge_conditions_single_node(node_out_type, edge_label, edge_conditions, node_id, direction):
+                if node.node_id not in seen:
+                    seen.add(node.node_id)
+                    yield node
+
+    # lazy filter_node_set_global_filterer: every matching node is followed by its related nodes
+    def iter_node_set_global_filterer(self, filtering_node_type, filtering_node_attributes, nodes_set_in, limit=None):
+        return self._limited(self._iter_node_set_global_filterer(filtering_node_type, filtering_node_attributes, nodes_set_in), limit)
+
+    def _iter_node_set_global_filterer(self, filtering_node_type, filtering_node_attributes, nodes_set_in):
+        if filtering_node_type not in GLOBAL_FILTERER_HOPS:
+            raise ValueError(f"Unknown filtering_node_type: {filtering_node_type}")
+        hops, chained = GLOBAL_FILTERER_HOPS[filtering_node_type]
+
+        contains = self._membership(nodes_set_in)
+        empty_conditions = {}
+        seen = set()
+        expanded = set()
+        for node in self._iter_by_node_conditions_for_set(nodes_set_in, filtering_node_type, filtering_node_attributes):
+            if node.node_id not in seen:
+                seen.add(node.node_id)
+                yield node
+
+            if chained:
+                (first_type, first_label), (second_type, second_label) = hops
+                for middle in self._iter_by_edge_conditions_single_node(first_type, first_label, empty_conditions, node.node_id, self._schema_direction(first_label, first_type)):
+                    if middle.node_id in expanded:
+                        continue
+                    expanded.add(middle.node_id)
+                    if contains(middle) and middle.node_id not in seen:
+                        seen.add(middle.node_id)
+                        yield middle
+                    for far in self._iter_by_edge_conditions_single_node(second_type, second_label, empty_conditions, middle.node_id, self._schema_direction(second_label, second_type)):
+                        if contains(far) and far.node_id not in seen:
+                            seen.add(far.node_id)
+                            yield far
+            else:
+                for hop_type, hop_label in hops:
+                    for related in self._iter_by_edge_conditions_single_node(hop_type, hop_label, empty_conditions, node.node_id, self._schema_direction(hop_label, hop_type)):
+                        if contains(related) and related.node_id not in seen:
+                            seen.add(related.node_id)
+                            yield related
+
+    # lazy filter_edge_set_global_filterer
+    def iter_edge_set_global_filterer(self, filtering_node_source_type, filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set_in, limit=None):
+        return self._limited(self._iter_edge_set_global_filterer(filtering_node_source_type, filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set_in), limit)
+
+    def _iter_edge_set_global_filterer(self, filtering_node_source_type, filtering_node_target_type, filtering_edge_label, filtering_edge_conditions, node_set_in):
+        filtering_node_combined_type = {filtering_node_source_type, filtering_node_target_type}
+        if 'company' not in filtering_node_combined_type:
+            raise ValueError(f"can not filter edges between people and events for the current schema")
+        elif 'people' not in filtering_node_combined_type:
+            filtering_node_remaining_type = 'people'
+            remaining_edge_label = 'works_at'
+        elif 'event' not in filtering_node_combined_type:
+            filtering_node_remaining_type = 'event'
+            remaining_edge_label = 'attends'
+        else:
+            raise ValueError(f"illegal type")
+
+        contains = self._membership(node_set_in)
+        empty_conditions = {}
+        seen = set()
+        expanded = set()
+        for node_id in self._iter_ids(node_set_in):
+            for node_type in (filtering_node_source_type, filtering_node_target_type):
+                for node in self._iter_by_edge_conditions_single_node(node_type, filtering_edge_label, filtering_edge_conditions, node_id, self._schema_direction(filtering_edge_label, node_type)):
+                    if not contains(node) or node.node_id in expanded:
+                        continue
+                    expanded.add(node.node_id)
+                    if node.node_id not in seen:
+                        seen.add(node.node_id)
+                        yield node
+                    # remaining nodes, like the eager version not restricted to node_set_in
+                    for remaining in self._iter_by_edge_conditions_single_node(filtering_node_remaining_type, remaining_edge_label, empty_conditions, node.node_id, self._schema_direction(remaining_edge_label, filtering_node_remaining_type)):
+                        if remaining.node_id not in seen:
+                            seen.add(remaining.node_id)
+                            yield remaining
+
+    # one page of a streaming filter: filter_page('iter_node_set_global_filterer', 'event', conditions, node_set, limit=50)
+    # returns (nodes, cursor). pass the cursor back with the same arguments to get the next page, the cursor is
+    # None after the last page. the stream (with its seen set) stays open under the cursor id, so the next page
+    # resumes the traversal where the last one stopped and paging through n results costs one traversal.
+    # a cursor whose stream was dropped (see MAX_PAGE_STREAMS) restarts the stream and skips its offset.
+    # cursors are only valid while the graph is not modified
+    def filter_page(self, iter_method_name, *args, limit=50, cursor=None):
+        version, offset, stream_id = cursor if cursor is not None else (self.version, 0, None)
+        entry = self._page_streams.pop(stream_id, None)
+        if version != self.version:
+            raise ValueError("Graph was modified since the cursor was created")
+        if entry is not None and entry[0] == iter_method_name and entry[1] == offset:
+            stream, nodes = entry[2], [entry[3]]
+        else:
+            stream, nodes = itertools.islice(getattr(self, iter_method_name)(*args), offset, None), []
+        # one extra node tells whether there is a next page
+        nodes.extend(itertools.islice(stream, limit + 1 - len(nodes)))
+        if len(nodes) <= limit:
+            return nodes, None
+        if stream_id is None:
+            stream_id = next(self._page_stream_ids)
+        self._page_streams[stream_id] = (iter_method_name, offset + limit, stream, nodes[limit])
+        while len(self._page_streams) > MAX_PAGE_STREAMS:
+            self._page_streams.popitem(last=False)
+        return nodes[:limit], (self.version, offset + limit, stream_id)
+
+    def _limited(self, stream, limit):
+        return stream if limit is None else itertools.islice(stream, limit)
+
+    def _iter_ids(self, node_set):
+        if isinstance(node_set, NodeSet):
+            return (self._node_id_at(i) for i in node_set)
+        return iter(node_set)
+
+    def _node_id_at(self, i):
+        return self.node_ids[i]
+
+    # membership test of a node in a set of ids or a NodeSet
+    def _membership(self, node_set):
+        if isinstance(node_set, NodeSet):
+            return lambda node: node.index in node_set
+        if not isinstance(node_set, (set, frozenset, dict)):
+            node_set = set(node_set)
+        return lambda node: node.node_id in node_set
+
+    def df_to_graph_insert_at_node(self, df, uid_column_name, node_type):
+        return self.bulk_insert_nodes(df, uid_column_name, node_type)
+
+    def df_to_graph_insert_as_edge(self, df, uid_column_node_origin, origin_type, uid_column_node_target, target_type, label):
+        return self.bulk_insert_edges(df, uid_column_node_origin, origin_type, uid_column_node_target, target_type, label)
+
+    # single pass over the rows of df (as plain dicts): creates missing nodes of node_type and sets
+    # every other column as attribute of the node identified by uid_column_name. when a uid appears in
+    # several rows, the later rows overwrite the earlier ones.
+    # returns load statistics, including rows/second
+    def bulk_insert_nodes(self, df, uid_column_name, node_type):
+        start = time.perf_counter()
+        nodes_created = 0
+        attribute_columns = [column for column in df.columns if column != uid_column_name]
+
+        for record in df.to_dict('records'):
+            uid = record[uid_column_name]
+            node = self.nodes.get(uid)
+            # if node not exist, create it
+            if node is None:
+                node = self.add_node(uid, node_type)
+                nodes_created += 1
+
+            for attribute in attribute_columns:
+                self._set_node_attribute(node, attribute, record[attribute])
+
+        return self._bulk_load_stats(len(df), start, nodes_created=nodes_created, edges_created=0)
+
+    # single pass over the rows of df: creates missing origin/target nodes, creates the edge of given label
+    # between them unless it already exists and sets every other column as attribute of that edge.
+    # returns load statistics, including rows/second
+    def bulk_insert_edges(self, df, uid_column_node_origin, origin_type, uid_column_node_target, target_type, label):
+        start = time.perf_counter()
+        nodes_created = 0
+        edges_created = 0
+        attribute_columns = [column for column in df.columns if column not in [uid_column_node_origin, uid_column_node_target]]
+
+        for record in df.to_dict('records'):
+            origin_id = record[uid_column_node_origin]
+            target_id = record[uid_column_node_target]
+
+            # Create nodes if don't exist
+            if origin_id not in self.nodes:
+                self.add_node(origin_id, origin_type)
+                nodes_created += 1
+            if target_id not in self.nodes:
+                self.add_node(target_id, target_type)
+                nodes_created += 1
+
+            # Create edge origin -> target if don't exist, duplicate rows resolve to the existing edge through the adjacency dict
+            origin = self.nodes[origin_id]
+            target = self.nodes[target_id]
+            edge = origin.get_edge(label, target.node_type, target_id, 'out')
+            if edge is None:
+                edge = self.add_edge(origin_id, target_id, label)
+                edges_created += 1
+
+            # Add attributes to the edge
+            for attribute in attribute_columns:
+                edge.add_attribute(attribute, record[attribute])
+            self.version += 1
+
+        return self._bulk_load_stats(len(df), start, nodes_created=nodes_created, edges_created=edges_created)
+
+    def _bulk_load_stats(self, rows, start, nodes_created, edges_created):
+        seconds = time.perf_counter() - start
+        return {
+            'rows': rows,
+            'nodes_created': nodes_created,
+            'edges_created': edges_created,
+            'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds > 0 else float('inf'),
+        }
+
+    # opt-in parallel mode for filter_by_edge_conditions_for_set (and so the global filterers): seed sets of at
+    # least min_seeds nodes are split across a pool of workers processes sharing a memory mapped snapshot
+    # of the graph, smaller ones keep running serially. see parallel.py
+    def enable_parallel(self, workers=None, min_seeds=10000, snapshot_path=None, mp_context=None):
+        # imported on first use, multiprocessing is not needed by graphs that never run in parallel
+        from .parallel import ParallelEdgeFilter
+        self.disable_parallel()
+        self.parallel = ParallelEdgeFilter(self, workers=workers, min_seeds=min_seeds, snapshot_path=snapshot_path, mp_context=mp_context)
+        return self.parallel
+
+    def disable_parallel(self):
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def _filter_by_edge_conditions_parallel(self, node_out_type, edge_label, edge_conditions, node_set, direction='both'):
+        if isinstance(node_set, NodeSet):
+            seeds = node_set
+        else:
+            for node_id in node_set:
+                if node_id not in self.nodes:
+                    raise ValueError(f"Node {node_id} does not exist")
+            seeds = self.node_set(node_set)
+        found = NodeSet.from_indices(self.parallel.filter(node_out_type, edge_label, edge_conditions, seeds.indices(), direction), len(self.nodes))
+        return found if isinstance(node_set, NodeSet) else self.node_set_nodes(found)
+
+    # materialized people <-> event reachability (see reachability.py), kept up to date by add_edge and used by
+    # filter_node_set_global_filterer instead of the second hop. companies with more than hub_threshold
+    # employee x event pairs, or beyond max_pairs in total, are traversed live
+    @profiled()
+    def enable_reachability(self, hub_threshold=100000, max_pairs=10000000):
+        self.reachability = ReachabilityIndex(self, hub_threshold=hub_threshold, max_pairs=max_pairs)
+        return self.reachability
+
+    def disable_reachability(self):
+        self.reachability = None
+
+    # opt-in instrumentation of the filters (see profiling.py): every call of a filter, global filterer or
+    # path query is recorded with its sub-steps, estimated and actual result sizes, time and counters.
+    # exporter is called with every finished top level profile (e.g. profiling.json_lines_exporter(path))
+    def enable_profiling(self, exporter=None, keep=100):
+        self.profiler = Profiler(exporter=exporter, keep=keep)
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler = None
+
+    # runs a filter by name with profiling and returns its QueryStep tree, print it for an EXPLAIN ANALYZE
+    # style report: graph.explain('filter_node_set_global_filterer', 'event', {'event_country': 'USA'}, full_set)
+    def explain(self, method_name, *args, **kwargs):
+        return explain(self, method_name, *args, **kwargs)
+
+    # hit/miss counters of the query result cache
+    def cache_info(self):
+        return self.query_cache.info() if self.query_cache is not None else None
+
+    # read-only copy of the graph on the compact array storage
+    def to_compact(self):
+        return CompactGraphDB(CSRStore.from_graph(self))
+
+    # binary snapshot of the graph (id dictionary, per-label adjacency arrays, columnar attributes), see csr_store.py
+    def save(self, path):
+        self.to_compact().store.save(path)
+
+    # read-only CompactGraphDB from a snapshot written by save. with mmap=True the file is memory mapped:
+    # loading takes milliseconds and processes mapping the same file share its pages
+    @staticmethod
+    def load(path, mmap=True):
+        return CompactGraphDB(CSRStore.load(path, mmap=mmap))
+
+    def __repr__(self):
+        return f"GraphDB(Nodes: {list(self.nodes.values())})"
+
+
+# dict-like view of the nodes of a CSRStore. Node objects are materialized on access (attributes only,
+# no edges) and shared while referenced, so results of different filters can still be combined as sets
+class CompactNodeView(Mapping):
+    def __init__(self, store):
+        self.store = store
+        self._materialized = weakref.WeakValueDictionary()
+
+    def __getitem__(self, node_id):
+        i = self.store.index_of(node_id)
+        if i < 0:
+            raise KeyError(node_id)
+        return self.node_at(i)
+
+    def node_at(self, i):
+        node = self._materialized.get(i)
+        if node is None:
+            node = Node(self.store.ids[i], self.store.node_type_of(i))
+            node.index = i
+            node.attributes = self.store.node_attributes(i)
+            self._materialized[i] = node
+        return node
+
+    def __contains__(self, node_id):
+        return node_id in self.store.index
+
+    def __iter__(self):
+        return iter(self.store.ids)
+
+    def __len__(self):
+        return len(self.store)
+
+
+# GraphDB running on the compact CSRStore: same filtering API, read-only.
+# node ids are interned to integers, adjacency is kept in CSR offset/target arrays per label and the
+# attributes column-wise per node_type, dictionary encoded
+class CompactGraphDB(GraphDB):
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.nodes = CompactNodeView(store)
+        self.attribute_index = None
+
+    def _read_only(self, *args, **kwargs):
+        raise ValueError("CompactGraphDB is read-only")
+
+    add_node = add_edge = add_node_attribute = add_edge_attribute = _read_only
+    bulk_insert_nodes = bulk_insert_edges = _read_only
+
+    def _nodes_at(self, indices):
+        return [self.nodes.node_at(i) for i in indices.tolist()]
+
+    def lookup_node_attribute(self, node_type, attribute, value):
+        return self.lookup_node_condition(node_type, attribute, ('==', value))
+
+    def lookup_node_condition(self, node_type, attribute, condition):
+        return {self.store.ids[i] for i in self.store.select_nodes(node_type, {attribute: condition}).tolist()}
+
+    def count_node_condition(self, node_type, attribute, condition):
+        return self.store.estimate_cardinality(node_type, {attribute: condition})
+
+    def node_set(self, node_ids):
+        return NodeSet.from_indices(self.store.indices_of(node_ids), len(self.store))
+
+    def node_set_ids(self, node_set):
+        return {self.store.ids[i] for i in node_set}
+
+    def node_set_nodes(self, node_set):
+        return self._nodes_at(node_set.indices())
+
+    def type_node_set(self, node_type):
+        cached = self._type_node_sets.get(node_type)
+        if cached is None:
+            cached = NodeSet.from_indices(self.store.nodes_of_type(node_type), len(self.store))
+            self._type_node_sets[node_type] = cached
+        return cached
+
+    @profiled(estimate=_estimate_node_filter)
+    def filter_by_node_conditions_for_set(self, node_set, node_type, node_conditions):
+        if not node_conditions:
+            return node_set
+        if isinstance(node_set, NodeSet):
+            matched = self.store.select_nodes(node_type, node_conditions)
+            return NodeSet.from_indices(matched[node_set.contains_many(matched)], len(self.store))
+        return self._nodes_at(self.store.filter_nodes(self.store.indices_of(node_set), node_type, node_conditions))
+
+    def _iter_by_edge_conditions_single_node(self, node_out_type, edge_label, edge_conditions, node_in_id, direction='both'):
+        return iter(self.filter_by_edge_conditions_single_node(node_out_type, edge_label, edge_conditions, node_in_id, direction))
+
+    def _node_id_at(self, i):
+        return self.store.ids[i]
+
+    @profiled(estimate=_estimate_single_node_edge_filter, nested=False)
+    def filter_by_edge_conditions_single_node(self, node_out_type, edge_label, edge_conditions, node_in_id, direction='both'):
+        i = self.store.index_of(node_in_id)
+        if i < 0:
+            raise ValueError("Node does not exist")
+        self._count_edges_visited(edge_label, [i], direction)
+        found = self.store.neighbours([i], edge_label, node_out_type, edge_conditions, direction)
+        if direction == 'both':
+            # a neighbour connected in both directions is only returned once, in order of first appearance
+            _, first = np.unique(found, return_index=True)
+            found = found[np.sort(first)]
+        return self._nodes_at(found)
+
+    @profiled(estimate=_estimate_edge_filter)
+    def filter_by_edge_conditions_for_set(self, node_out_type, edge_label, edge_conditions, node_set, direction='both'):
+        if self.parallel is not None and self.parallel.should_run(len(node_set)):
+            return self._filter_by_edge_conditions_parallel(node_out_type, edge_label, edge_conditions, node_set, direction)
+        if isinstance(node_set, NodeSet):
+            seeds = node_set.indices()
+            self._count_edges_visited(edge_label, seeds, direction)
+            return NodeSet.from_indices(self.store.neighbours(seeds, edge_label, node_out_type, edge_conditions, direction), len(self.store))
+        for node_id in node_set:
+            if node_id not in self.store.index:
+                raise ValueError(f"Node {node_id} does not exist")
+        seeds = self.store.indices_of(node_set)
+        self._count_edges_visited(edge_label, seeds, direction)
+        return self._nodes_at(np.unique(self.store.neighbours(seeds, edge_label, node_out_type, edge_conditions, direction)))
+
+    def _count_edges_visited(self, edge_label, seeds, direction):
+        if self.profiler is not None:
+            self.profiler.count(f"edges_visited[{edge_label}]", self.store.degree(seeds, edge_label, direction))
+
+    def nodes_of_type(self, node_type):
+        return {self.store.ids[i] for i in self.store.nodes_of_type(node_type).tolist()}
+
+    def node_attribute_names(self, node_type):
+        return set(self.store.node_columns[node_type])
+
+    def estimate_cardinality(self, node_type, node_conditions):
+        return self.store.estimate_cardinality(node_type, node_conditions)
+
+    def average_degree(self, edge_label, node_type):
+        return self.store.edge_count(edge_label) / max(len(self.store.nodes_of_type(node_type)), 1)
+
+    def to_compact(self):
+        return self
+
+    def __repr__(self):
+        return f"CompactGraphDB(Nodes: {len(self.nodes)}, Bytes: {self.store.nbytes()})"
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+def _popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+# dense bitset over integer node indices (see GraphDB.node_set), stored as 64 bit words.
+# intersection, union, difference and membership tests run as word-level numpy operations,
+# so chained filters do not allocate a python object per node. immutable, operators return new sets
+class NodeSet:
+    def __init__(self, words):
+        self.words = words
+
+    @classmethod
+    def empty(cls, capacity=0):
+        return cls(np.zeros((capacity + 63) // 64, dtype=np.uint64))
+
+    @classmethod
+    def from_indices(cls, indices, capacity):
+        n_words = (capacity + 63) // 64
+        mask = np.zeros(n_words * 64, dtype=bool)
+        mask[np.asarray(indices, dtype=np.int64)] = True
+        return cls(np.packbits(mask, bitorder='little').view('<u8').astype(np.uint64, copy=False))
+
+    @property
+    def capacity(self):
+        return len(self.words) * 64
+
+    # both word arrays padded with zeros to the same length
+    def _aligned(self, other):
+        if len(self.words) == len(other.words):
+            return self.words, other.words
+        n_words = max(len(self.words), len(other.words))
+        return (np.pad(self.words, (0, n_words - len(self.words))),
+                np.pad(other.words, (0, n_words - len(other.words))))
+
+    def __and__(self, other):
+        n_words = min(len(self.words), len(other.words))
+        return NodeSet(self.words[:n_words] & other.words[:n_words])
+
+    def __or__(self, other):
+        words, other_words = self._aligned(other)
+        return NodeSet(words | other_words)
+
+    def __sub__(self, other):
+        words, other_words = self._aligned(other)
+        return NodeSet((words & ~other_words)[:len(self.words)])
+
+    def __contains__(self, index):
+        word = index >> 6
+        return 0 <= word < len(self.words) and bool((int(self.words[word]) >> (index & 63)) & 1)
+
+    # vectorized membership test for an array of indices
+    def contains_many(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        words = indices >> 6
+        inside = words < len(self.words)
+        result = np.zeros(len(indices), dtype=bool)
+        result[inside] = ((self.words[words[inside]] >> (indices[inside] & 63).astype(np.uint64)) & np.uint64(1)) == 1
+        return result
+
+    def indices(self):
+        return np.flatnonzero(np.unpackbits(self.words.astype('<u8', copy=False).view(np.uint8), bitorder='little'))
+
+    def __iter__(self):
+        return iter(self.indices().tolist())
+
+    def __len__(self):
+        return _popcount(self.words)
+
+    def __bool__(self):
+        return bool(self.words.any())
+
+    def _trimmed(self):
+        nonzero = np.flatnonzero(self.words)
+        return self.words[:nonzero[-1] + 1] if len(nonzero) else self.words[:0]
+
+    def __eq__(self, other):
+        if not isinstance(other, NodeSet):
+            return NotImplemented
+        return np.array_equal(self._trimmed(), other._trimmed())
+
+    def __hash__(self):
+        return hash(self._trimmed().tobytes())
+
+    def __repr__(self):
+        return f"NodeSet({len(self)} nodes)"
@@ -0,0 +1,77 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .csr_store import CSRStore
+
+# parallel execution of filter_by_edge_conditions_for_set: the seed set is split into shards, every shard
+# is filtered by a worker process and the per-shard neighbours are merged. workers memory map the same
+# snapshot of the graph (see GraphDB.save), so the graph is shared read-only between processes.
+# this module does not import graphdb.graph, starting a worker only loads the snapshot header
+
+# snapshot of the graph, loaded once per worker process
+_worker_store = None
+
+
+def _init_worker(snapshot_path):
+    global _worker_store
+    _worker_store = CSRStore.load(snapshot_path, mmap=True)
+
+
+def _filter_shard(seeds, edge_label, node_out_type, edge_conditions, direction):
+    return np.unique(_worker_store.neighbours(seeds, edge_label, node_out_type, edge_conditions, direction))
+
+
+class ParallelEdgeFilter:
+    # workers: number of processes (default: cpu count), min_seeds: seed sets smaller than this run serially,
+    # snapshot_path: where the shared snapshot is written (default: a temporary file removed by close)
+    def __init__(self, graph, workers=None, min_seeds=10000, snapshot_path=None, mp_context=None):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.min_seeds = min_seeds
+        self.mp_context = mp_context
+        self._owns_snapshot = snapshot_path is None
+        if snapshot_path is None:
+            handle, snapshot_path = tempfile.mkstemp(suffix='.snap')
+            os.close(handle)
+        self.snapshot_path = snapshot_path
+        self._pool = None
+        self._snapshot_version = None
+
+    def should_run(self, n_seeds):
+        return self.workers > 1 and n_seeds >= self.min_seeds
+
+    # (re)writes the snapshot and restarts the workers when the graph changed since the last call.
+    # snapshot indices are the graph's dense node indices, so seeds and results travel as integer arrays
+    def _ensure_pool(self):
+        if self._pool is not None and self._snapshot_version == self.graph.version:
+            return
+        self._shutdown_pool()
+        self.graph.save(self.snapshot_path)
+        self._snapshot_version = self.graph.version
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.mp_context,
+                                         initializer=_init_worker, initargs=(self.snapshot_path,))
+
+    # node indices of node_out_type reached from the seed indices, deduplicated and sorted
+    def filter(self, node_out_type, edge_label, edge_conditions, seeds, direction='both'):
+        self._ensure_pool()
+        # a few shards per worker, so one slow shard does not hold up the others
+        shards = [shard for shard in np.array_split(np.asarray(seeds, dtype=np.int64), self.workers * 4) if len(shard)]
+        futures = [self._pool.submit(_filter_shard, shard, edge_label, node_out_type, dict(edge_conditions or {}), direction)
+                   for shard in shards]
+        results = [future.result() for future in futures]
+        if not results:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(results))
+
+    def _shutdown_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def close(self):
+        self._shutdown_pool()
+        if self._owns_snapshot and os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
@@ -0,0 +1,252 @@
+import re
+
+# declarative path queries over a GraphDB (or CompactGraphDB), for example
+#   people -works_at-> company{industry=Finance} -attends-> event{industry=Technology}
+# returns the nodes of the first step (here: people) having at least one complete path matching the query.
+# steps are node types with optional node conditions, hops are edge labels with optional edge conditions.
+# hops are directed: -label-> follows edges from the left step to the right step, <-label- from the right
+# step to the left step, -label- edges in either direction.
+# a condition key not found on the node type is retried with the type prefix (industry -> company_industry)
+# conditions: key=value, key>=value, key<=value, key=low..high (between), key=a|b|c (in), key^=text (prefix).
+# unquoted numbers are parsed as int or float (revenue>=2000), quoted values always stay strings (zip="02139")
+
+STEP_RE = re.compile(r'\s*(\w+)\s*(\{[^}]*\})?')
+HOP_RE = re.compile(r'\s*(<)?-\s*(\w+)\s*(\{[^}]*\})?\s*-(>)?')
+CONDITION_RE = re.compile(r'\s*(\w+)\s*(>=|<=|\^=|=)\s*((?:"[^"]*"|[^,"])*)\s*(?:,|$)')
+INT_RE = re.compile(r'[-+]?\d+')
+FLOAT_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+
+ATTRIBUTE_PREFIXES = {'people': 'person_', 'company': 'company_', 'event': 'event_'}
+
+
+class PathStep:
+    def __init__(self, node_type, node_conditions):
+        self.node_type = node_type
+        self.node_conditions = node_conditions
+
+    def __repr__(self):
+        return f"PathStep({self.node_type}, {self.node_conditions})"
+
+
+class PathHop:
+    # direction of the edges seen from the left step: 'out', 'in' or 'both'
+    def __init__(self, edge_label, edge_conditions, direction='out'):
+        self.edge_label = edge_label
+        self.edge_conditions = edge_conditions
+        self.direction = direction
+
+    # direction of the edges when walking the hop from from_index to to_index
+    def direction_from(self, from_index, to_index):
+        if from_index < to_index:
+            return self.direction
+        return {'out': 'in', 'in': 'out', 'both': 'both'}[self.direction]
+
+    def __repr__(self):
+        return f"PathHop({self.edge_label}, {self.edge_conditions}, {self.direction})"
+
+
+# a single value of a condition: quoted text, an int, a float or unquoted text
+def _literal(text, condition):
+    text = text.strip()
+    if text.startswith('"'):
+        if len(text) < 2 or not text.endswith('"') or '"' in text[1:-1]:
+            raise ValueError(f"Illegal quoted value in path query condition: {condition}")
+        return text[1:-1]
+    if '"' in text:
+        raise ValueError(f"Illegal quoted value in path query condition: {condition}")
+    if INT_RE.fullmatch(text):
+        return int(text)
+    if FLOAT_RE.fullmatch(text):
+        return float(text)
+    return text
+
+
+# splits text on separator outside of quoted values
+def _split_values(text, separator):
+    values = ['']
+    for part in re.split(r'(' + re.escape(separator) + r'|"[^"]*")', text):
+        if part == separator:
+            values.append('')
+        else:
+            values[-1] += part
+    return values
+
+
+def _condition_value(operator, text, condition):
+    if operator == '^=':
+        value = _literal(text, condition)
+        if not isinstance(value, str):
+            value = text.strip()
+        return ('prefix', value)
+    if operator in ('>=', '<='):
+        return (operator, _literal(text, condition))
+    values = _split_values(text, '|')
+    if len(values) > 1:
+        return ('in', [_literal(value, condition) for value in values])
+    bounds = _split_values(text, '..')
+    if len(bounds) == 2:
+        low, high = (_literal(bound, condition) for bound in bounds)
+        # only numbers form a range, text like "a..b" is compared as is
+        if not isinstance(low, str) and not isinstance(high, str):
+            return ('between', low, high)
+    return _literal(text, condition)
+
+
+def _parse_conditions(text):
+    conditions = {}
+    if not text:
+        return conditions
+    body = text[1:-1].strip()
+    position = 0
+    while position < len(body):
+        match = CONDITION_RE.match(body, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Illegal condition in path query: {text}")
+        conditions[match.group(1)] = _condition_value(match.group(2), match.group(3), match.group(0).strip(' ,'))
+        position = match.end()
+    return conditions
+
+
+def parse_path(path):
+    steps = []
+    hops = []
+
+    match = STEP_RE.match(path)
+    if match is None:
+        raise ValueError(f"Illegal path query: {path}")
+    steps.append(PathStep(match.group(1), _parse_conditions(match.group(2))))
+    position = match.end()
+
+    while path[position:].strip():
+        hop_match = HOP_RE.match(path, position)
+        if hop_match is None:
+            raise ValueError(f"Illegal path query, expected -label->, <-label- or -label- at: {path[position:]}")
+        incoming, outgoing = hop_match.group(1), hop_match.group(4)
+        if incoming and outgoing:
+            raise ValueError(f"Illegal path query, a hop has one direction, use -label- for both at: {path[position:]}")
+        step_match = STEP_RE.match(path, hop_match.end())
+        if step_match is None:
+            raise ValueError(f"Illegal path query, expected node type at: {path[hop_match.end():]}")
+        direction = 'in' if incoming else 'out' if outgoing else 'both'
+        hops.append(PathHop(hop_match.group(2), _parse_conditions(hop_match.group(3)), direction))
+        steps.append(PathStep(step_match.group(1), _parse_conditions(step_match.group(2))))
+        position = step_match.end()
+
+    for step in steps:
+        if step.node_type not in ATTRIBUTE_PREFIXES:
+            raise ValueError(f"Unknown node type in path query: {step.node_type}")
+    return steps, hops
+
+
+# maps shorthand condition keys to the attribute names stored in the graph
+def resolve_conditions(graph, node_type, node_conditions):
+    known = graph.node_attribute_names(node_type)
+    resolved = {}
+    for key, value in node_conditions.items():
+        if key not in known and ATTRIBUTE_PREFIXES[node_type] + key in known:
+            key = ATTRIBUTE_PREFIXES[node_type] + key
+        resolved[key] = value
+    return resolved
+
+
+class PathPlan:
+    def __init__(self, steps, hops, anchor, side_order, estimates, cost):
+        self.steps = steps
+        self.hops = hops
+        # index of the step the traversal starts from
+        self.anchor = anchor
+        # sides of the anchor ('left', 'right') in the order they are reduced
+        self.side_order = side_order
+        # estimated number of nodes matching each step on its own
+        self.estimates = estimates
+        # estimated number of edge visits
+        self.cost = cost
+
+    def __repr__(self):
+        return f"PathPlan(anchor={self.anchor} {self.steps[self.anchor]}, sides={self.side_order}, estimates={self.estimates}, cost={self.cost:.0f})"
+
+
+# estimated edge visits to walk from the anchor to the end of one side
+def _side_cost(graph, steps, hops, estimates, anchor, direction):
+    cost = 0.0
+    frontier = estimates[anchor]
+    j = anchor
+    while 0 <= j + direction < len(steps):
+        hop = hops[j] if direction > 0 else hops[j - 1]
+        next_step = steps[j + direction]
+        visits = frontier * graph.average_degree(hop.edge_label, steps[j].node_type)
+        cost += visits
+        type_count = max(graph.estimate_cardinality(next_step.node_type, {}), 1)
+        frontier = min(visits, type_count) * estimates[j + direction] / type_count
+        j += direction
+    return cost
+
+
+# picks the anchor step and the order of the sides with the lowest estimated number of edge visits
+def plan_path(graph, path):
+    steps, hops = parse_path(path)
+    for step in steps:
+        step.node_conditions = resolve_conditions(graph, step.node_type, step.node_conditions)
+    estimates = [graph.estimate_cardinality(step.node_type, step.node_conditions) for step in steps]
+
+    best = None
+    for anchor in range(len(steps)):
+        side_costs = {
+            'left': _side_cost(graph, steps, hops, estimates, anchor, -1),
+            'right': _side_cost(graph, steps, hops, estimates, anchor, 1),
+        }
+        cost = estimates[anchor] + side_costs['left'] + side_costs['right']
+        if best is None or cost < best.cost:
+            side_order = sorted((side for side in side_costs if (anchor > 0 if side == 'left' else anchor < len(steps) - 1)), key=side_costs.get)
+            best = PathPlan(steps, hops, anchor, side_order, estimates, cost)
+    return best
+
+
+def _node_ids(nodes):
+    return {node.node_id for node in nodes}
+
+
+# ids of the nodes of step to_index reachable from frontier (ids of step from_index) and matching the step
+def _expand(graph, plan, frontier, from_index, to_index):
+    hop = plan.hops[min(from_index, to_index)]
+    step = plan.steps[to_index]
+    reached = _node_ids(graph.filter_by_edge_conditions_for_set(step.node_type, hop.edge_label, hop.edge_conditions, frontier,
+                                                                hop.direction_from(from_index, to_index)))
+    if not step.node_conditions:
+        return reached
+    return _node_ids(graph.filter_by_node_conditions_for_set(reached, step.node_type, step.node_conditions))
+
+
+def execute_plan(graph, plan):
+    anchor_step = plan.steps[plan.anchor]
+    anchor_ids = graph.nodes_of_type(anchor_step.node_type)
+    if anchor_step.node_conditions:
+        anchor_ids = _node_ids(graph.filter_by_node_conditions_for_set(anchor_ids, anchor_step.node_type, anchor_step.node_conditions))
+
+    # semi-join reduction of the anchor: walk to the end of each side, then back, keeping only nodes
+    # that are part of a complete path. frontiers are sets of ids, so they are deduplicated between hops
+    frontiers = {plan.anchor: set(anchor_ids)}
+    for side in plan.side_order:
+        direction = -1 if side == 'left' else 1
+        j = plan.anchor
+        while 0 <= j + direction < len(plan.steps) and frontiers[j]:
+            frontiers[j + direction] = _expand(graph, plan, frontiers[j], j, j + direction)
+            j += direction
+        while j != plan.anchor:
+            frontiers[j - direction] &= _expand(graph, plan, frontiers[j], j, j - direction)
+            j -= direction
+
+    # the final anchor set only keeps nodes completing both sides, carry it back to the first step
+    result = frontiers[plan.anchor]
+    for j in range(plan.anchor, 0, -1):
+        if not result:
+            break
+        result = frontiers[j - 1] & _expand(graph, plan, result, j, j - 1)
+    return [graph.nodes[node_id] for node_id in result]
+
+
+def query_path(graph, path):
+    plan = plan_path(graph, path)
+    if graph.profiler is not None:
+        graph.profiler.annotate(plan=repr(plan))
+    return execute_plan(graph, plan)
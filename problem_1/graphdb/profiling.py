@@ -0,0 +1,198 @@
+import functools
+import json
+import time
+from collections import deque
+
+from .nodeset import NodeSet
+
+# opt-in query instrumentation, see GraphDB.enable_profiling and GraphDB.explain.
+# every profiled filter call is recorded as a QueryStep: arguments, estimated and actual result size, time
+# and counters (nodes scanned, edges visited per label, cache hits, ...). profiled calls made while another
+# one runs become its children, so a global filterer call is recorded as the tree of the filters it ran.
+# finished top level steps are kept in Profiler.profiles and passed to the exporter hook.
+# while profiling is disabled (graph.profiler is None) a profiled method only pays one attribute check
+
+
+def _describe(argument):
+    if isinstance(argument, NodeSet):
+        return f"<NodeSet {len(argument)} nodes>"
+    if isinstance(argument, (set, frozenset, list)) and len(argument) > 5:
+        return f"<{len(argument)} nodes>"
+    text = repr(argument)
+    return text if len(text) <= 80 else text[:77] + '...'
+
+
+def _result_size(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+class QueryStep:
+    def __init__(self, name, arguments, estimated):
+        self.name = name
+        self.arguments = arguments
+        self.estimated = estimated
+        self.actual = None
+        self.seconds = None
+        self.error = None
+        self.counters = {}
+        # free form annotations, e.g. the plan of a path query
+        self.info = {}
+        self.children = []
+        self.started = None
+
+    def count(self, counter, n=1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    # counters of the step and all its children added up
+    def total_counters(self):
+        totals = dict(self.counters)
+        for child in self.children:
+            for counter, n in child.total_counters().items():
+                totals[counter] = totals.get(counter, 0) + n
+        return totals
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'arguments': self.arguments,
+            'estimated': self.estimated,
+            'actual': self.actual,
+            'seconds': self.seconds,
+            'error': self.error,
+            'counters': self.counters,
+            'info': self.info,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    # indented EXPLAIN style text of the step tree
+    def render(self, depth=0):
+        parts = [f"{'  ' * depth}{self.name}({', '.join(self.arguments)})",
+                 f"estimated={self.estimated}", f"actual={self.actual}"]
+        if self.seconds is not None:
+            parts.append(f"{self.seconds * 1000:.3f} ms")
+        parts += [f"{counter}={n}" for counter, n in sorted(self.counters.items())]
+        if self.error is not None:
+            parts.append(f"error={self.error}")
+        lines = ['  '.join(parts)]
+        lines += [f"{'  ' * (depth + 1)}{key}: {value}" for key, value in self.info.items()]
+        lines += [child.render(depth + 1) for child in self.children]
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return f"QueryStep({self.name}, estimated={self.estimated}, actual={self.actual}, seconds={self.seconds})"
+
+
+class Profiler:
+    # exporter: called with the dict form (QueryStep.to_dict) of every finished top level step,
+    # keep: number of finished top level steps kept in profiles
+    def __init__(self, exporter=None, keep=100):
+        self.exporter = exporter
+        self.profiles = deque(maxlen=keep)
+        self.stack = []
+        # per method name: number of calls, seconds and result rows, nested calls included
+        self.totals = {}
+
+    @property
+    def active(self):
+        return bool(self.stack)
+
+    def start(self, name, arguments, estimated):
+        step = QueryStep(name, arguments, estimated)
+        if self.stack:
+            self.stack[-1].children.append(step)
+        self.stack.append(step)
+        step.started = time.perf_counter()
+        return step
+
+    def finish(self, step, result=None, error=None):
+        step.seconds = time.perf_counter() - step.started
+        if error is not None:
+            step.error = repr(error)
+        else:
+            step.actual = _result_size(result)
+        self.stack.pop()
+
+        totals = self.totals.setdefault(step.name, {'calls': 0, 'seconds': 0.0, 'rows': 0})
+        totals['calls'] += 1
+        totals['seconds'] += step.seconds
+        totals['rows'] += step.actual or 0
+
+        if not self.stack:
+            self.profiles.append(step)
+            if self.exporter is not None:
+                self.exporter(step.to_dict())
+
+    # adds to a counter of the running step, ignored outside of a profiled call
+    def count(self, counter, n=1):
+        if self.stack:
+            self.stack[-1].count(counter, n)
+
+    def annotate(self, **info):
+        if self.stack:
+            self.stack[-1].info.update(info)
+
+    # the most recent top level step
+    def last(self):
+        return self.profiles[-1] if self.profiles else None
+
+    def summary(self):
+        return {name: dict(totals) for name, totals in self.totals.items()}
+
+    def clear(self):
+        self.profiles.clear()
+        self.totals.clear()
+
+
+# records calls of a GraphDB method as QuerySteps while graph.profiler is set. estimate(graph, *args, **kwargs)
+# returns the estimated result size. nested=False records the call only when no other step is running,
+# for per-node methods that the set filters call in a loop (they still add to the running step's counters)
+def profiled(estimate=None, nested=True):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None or (not nested and profiler.active):
+                return method(self, *args, **kwargs)
+            estimated = estimate(self, *args, **kwargs) if estimate is not None else None
+            arguments = [_describe(argument) for argument in args] + [f"{name}={_describe(value)}" for name, value in kwargs.items()]
+            step = profiler.start(method.__name__, arguments, estimated)
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as error:
+                profiler.finish(step, error=error)
+                raise
+            profiler.finish(step, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# runs getattr(graph, method_name)(*args, **kwargs) with profiling and returns its QueryStep tree.
+# the query result cache is bypassed, so the steps show the work of the query and not a cache hit
+def explain(graph, method_name, *args, **kwargs):
+    temporary = graph.profiler is None
+    if temporary:
+        graph.profiler = Profiler()
+    cache = graph.query_cache
+    graph.query_cache = None
+    try:
+        getattr(graph, method_name)(*args, **kwargs)
+        return graph.profiler.last()
+    finally:
+        graph.query_cache = cache
+        if temporary:
+            graph.profiler = None
+
+
+# exporter appending every finished profile as one json line to path
+def json_lines_exporter(path):
+    def export(profile):
+        with open(path, 'a') as f:
+            f.write(json.dumps(profile, default=str) + '\n')
+    return export
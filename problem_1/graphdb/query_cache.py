@@ -0,0 +1,103 @@
+import functools
+import hashlib
+from collections import OrderedDict
+
+from .nodeset import NodeSet
+
+
+# bounded LRU cache of filter results. every entry remembers the graph version it was computed at,
+# entries from an older version count as misses (the graph bumps its version on every modification)
+class QueryCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, key, version, value):
+        self.entries[key] = (version, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
+
+
+def _digest(node_set):
+    return hashlib.blake2b(node_set._trimmed().tobytes(), digest_size=16).digest()
+
+
+# hashable form of a filter argument. NodeSet inputs are reduced to a 128 bit digest of their bitset words.
+# sets nested in conditions (small value lists) are keyed on their frozenset, input node sets see input_key
+def normalize_argument(argument):
+    if isinstance(argument, NodeSet):
+        return ('NodeSet', _digest(argument))
+    if isinstance(argument, dict):
+        return frozenset((key, normalize_argument(value)) for key, value in argument.items())
+    if isinstance(argument, (set, frozenset)):
+        return ('frozenset', frozenset(argument))
+    if isinstance(argument, (list, tuple)):
+        try:
+            return (type(argument).__name__, tuple(normalize_argument(value) for value in argument))
+        except TypeError:
+            return (type(argument).__name__, repr(argument))
+    return argument
+
+
+# cache key of an argument of a cached filter. an input set of node ids is keyed on the digest of
+# the NodeSet the filters turn it into (ids not in the graph are dropped there too), so neither the set nor
+# a copy of it is kept in the cache
+def input_key(graph, argument):
+    if isinstance(argument, (set, frozenset)):
+        return ('set', _digest(graph.node_set(argument)))
+    return normalize_argument(argument)
+
+
+def _copy_result(result):
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, set):
+        return set(result)
+    return result
+
+
+# caches the results of a GraphDB method in graph.query_cache, keyed on the method name and the normalized
+# arguments, valid as long as graph.version does not change. callers get their own copy of list/set results
+def cached_query(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.query_cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (method.__name__,
+               tuple(input_key(self, argument) for argument in args),
+               frozenset((name, input_key(self, value)) for name, value in kwargs.items()))
+        hit, result = cache.get(key, self.version)
+        if hit and self.profiler is not None:
+            self.profiler.count('cache_hits')
+        if not hit:
+            result = method(self, *args, **kwargs)
+            cache.put(key, self.version, result)
+        return _copy_result(result)
+    return wrapper
@@ -0,0 +1,132 @@
+import sys
+
+from .nodeset import NodeSet
+
+# materialized reachability between people and events through people -works_at-> company -attends-> event:
+# per person the events its employers attend, per event the people working for its attending companies.
+# both sides are sets of dense node indices (the integer ids NodeSet uses), so set lookups return NodeSets.
+# the index only grows: edges are never removed from a GraphDB, so a materialized pair stays valid.
+#
+# a company contributes employees x events pairs. companies above hub_threshold pairs, or whose pairs
+# would push the index over max_pairs, become hubs: their pairs are not materialized, lookups reach
+# their employees / events by live traversal instead. memory therefore stays bounded by max_pairs
+
+
+class ReachabilityIndex:
+    # hub_threshold: pairs of a single company above which it is traversed live,
+    # max_pairs: maximum number of (person, event) pairs materialized in total
+    def __init__(self, graph, hub_threshold=100000, max_pairs=10000000):
+        self.graph = graph
+        self.hub_threshold = hub_threshold
+        self.max_pairs = max_pairs
+        # node index -> set of node indices
+        self.person_events = {}
+        self.event_people = {}
+        self.pairs = 0
+        # hub companies, and per person / event the hub companies it is connected to
+        self.hubs = set()
+        self.person_hubs = {}
+        self.event_hubs = {}
+
+        for company_id in graph.nodes_of_type('company'):
+            employees = [node.index for node in graph.filter_by_edge_conditions_single_node('people', 'works_at', {}, company_id, 'in')]
+            events = [node.index for node in graph.filter_by_edge_conditions_single_node('event', 'attends', {}, company_id, 'out')]
+            self._add_company_pairs(graph.nodes[company_id].index, employees, events, employees, events)
+
+    # called by GraphDB.add_edge: adds the pairs created by the new edge only
+    def edge_added(self, edge):
+        if edge.label == 'works_at' and (edge.source.node_type, edge.target.node_type) == ('people', 'company'):
+            company = edge.target
+            if company.index in self.hubs:
+                self.person_hubs.setdefault(edge.source.index, set()).add(company.index)
+                return
+            employees, events = self._company_neighbours(company)
+            self._add_company_pairs(company.index, employees, events, [edge.source.index], events)
+        elif edge.label == 'attends' and (edge.source.node_type, edge.target.node_type) == ('company', 'event'):
+            company = edge.source
+            if company.index in self.hubs:
+                self.event_hubs.setdefault(edge.target.index, set()).add(company.index)
+                return
+            employees, events = self._company_neighbours(company)
+            self._add_company_pairs(company.index, employees, events, employees, [edge.target.index])
+
+    def _company_neighbours(self, company):
+        nodes = self.graph.nodes
+        employees = [nodes[node_id].index for node_id in company.in_adjacency.get(('works_at', 'people'), {})]
+        events = [nodes[node_id].index for node_id in company.out_adjacency.get(('attends', 'event'), {})]
+        return employees, events
+
+    # materializes new_people x new_events for a company with the given employees and events,
+    # or turns the company into a hub when it gets too large for the index
+    def _add_company_pairs(self, company, employees, events, new_people, new_events):
+        if len(employees) * len(events) > self.hub_threshold or self.pairs + len(new_people) * len(new_events) > self.max_pairs:
+            self.hubs.add(company)
+            for person in employees:
+                self.person_hubs.setdefault(person, set()).add(company)
+            for event in events:
+                self.event_hubs.setdefault(event, set()).add(company)
+            return
+
+        for person in new_people:
+            person_events = self.person_events.setdefault(person, set())
+            for event in new_events:
+                if event not in person_events:
+                    person_events.add(event)
+                    self.event_people.setdefault(event, set()).add(person)
+                    self.pairs += 1
+
+    # people working for a company attending any of the events (NodeSet in, NodeSet out)
+    def people_of_events(self, events):
+        return self._reached(events, self.event_people, self.event_hubs, 'people', 'works_at', 'in')
+
+    # events attended by a company employing any of the people (NodeSet in, NodeSet out)
+    def events_of_people(self, people):
+        return self._reached(people, self.person_events, self.person_hubs, 'event', 'attends', 'out')
+
+    # single lookups, ids in and out
+    def people_of_event(self, event_id):
+        return self._reached_ids(event_id, self.event_people, self.event_hubs, 'people', 'works_at', 'in')
+
+    def events_of_person(self, person_id):
+        return self._reached_ids(person_id, self.person_events, self.person_hubs, 'event', 'attends', 'out')
+
+    def _reached_ids(self, node_id, materialized, hubs_of, out_type, hub_label, hub_direction):
+        if node_id not in self.graph.nodes:
+            raise ValueError("Node does not exist")
+        i = self.graph.nodes[node_id].index
+        node_id_at = self.graph._node_id_at
+        reached = {node_id_at(j) for j in materialized.get(i, ())}
+        hubs = hubs_of.get(i)
+        if hubs:
+            hub_ids = {node_id_at(hub) for hub in hubs}
+            reached.update(node.node_id for node in self.graph.filter_by_edge_conditions_for_set(out_type, hub_label, {}, hub_ids, hub_direction))
+        return reached
+
+    def _reached(self, node_set, materialized, hubs_of, out_type, hub_label, hub_direction):
+        reached = set()
+        hubs = set()
+        for i in node_set:
+            reached.update(materialized.get(i, ()))
+            hubs.update(hubs_of.get(i, ()))
+        if self.graph.profiler is not None:
+            self.graph.profiler.count('reachability_nodes', len(reached))
+        capacity = len(self.graph.nodes)
+        found = NodeSet.from_indices(list(reached), capacity)
+        if hubs:
+            # live traversal from the hub companies
+            hub_set = NodeSet.from_indices(list(hubs), capacity)
+            found = found | self.graph.filter_by_edge_conditions_for_set(out_type, hub_label, {}, hub_set, hub_direction)
+        return found
+
+    # size of the index: materialized pairs, hubs and the approximate bytes of its dicts and sets
+    def memory_info(self):
+        containers = [self.person_events, self.event_people, self.person_hubs, self.event_hubs, self.hubs]
+        containers += list(self.person_events.values()) + list(self.event_people.values())
+        containers += list(self.person_hubs.values()) + list(self.event_hubs.values())
+        return {
+            'pairs': self.pairs,
+            'max_pairs': self.max_pairs,
+            'hubs': len(self.hubs),
+            'hub_threshold': self.hub_threshold,
+            'bytes': sum(sys.getsizeof(container) for container in containers),
+        }
@@ -0,0 +1,130 @@
+# demo on a small sample graph, run with: python run_demo.py
+import pandas as pd
+from tabulate import tabulate
+
+from graphdb import GraphDB
+
+graph = GraphDB()
+# Events dataframe
+events_data = {
+    'event_url': ['event1.com', 'event2.com', 'event3.com', 'event4.com', 'event5.com'],
+    'event_name': ['Tech Summit 2024', 'Green Energy Expo', 'Global Finance Forum', 'AI Revolution Conference', 'Healthcare Innovation Summit'],
+    'event_start_date': ['2024-10-15', '2024-11-22', '2024-09-05', '2024-12-01', '2024-08-18'],
+    'event_city': ['San Francisco', 'Berlin', 'New York', 'Tokyo', 'London'],
+    'event_country': ['USA', 'Germany', 'USA', 'Japan', 'UK'],
+    'event_industry': ['Technology', 'Energy', 'Finance', 'Technology', 'Healthcare']
+}
+
+df_events = pd.DataFrame(events_data)
+graph.df_to_graph_insert_at_node(df_events, 'event_url', 'event')
+
+# Companies dataframe
+companies_data = {
+    'company_url': ['techco.com', 'greenergy.com', 'megabank.com', 'aiinnovate.com', 'healthtech.com'],
+    'company_name': ['TechCo', 'GreenErgy', 'MegaBank', 'AI Innovate', 'HealthTech'],
+    'company_industry': ['Technology', 'Energy', 'Finance', 'Technology', 'Healthcare'],
+    'company_revenue': ['$500M', '$200M', '$2B', '$100M', '$300M'],
+    'company_country': ['USA', 'Germany', 'USA', 'Japan', 'UK']
+}
+df_companies = pd.DataFrame(companies_data)
+graph.df_to_graph_insert_at_node(df_companies, 'company_url', 'company')
+
+# Event attendees dataframe
+attendees_data = {
+    'event_url': ['event1.com', 'event1.com', 'event2.com', 'event3.com', 'event4.com', 'event5.com', 'event5.com'],
+    'company_url': ['techco.com', 'aiinnovate.com', 'greenergy.com', 'megabank.com', 'aiinnovate.com', 'healthtech.com', 'techco.com'],
+    'company_relation_to_event': ['Sponsor', 'Attendee', 'Exhibitor', 'Sponsor', 'Keynote Speaker', 'Sponsor', 'Attendee']
+}
+
+df_attendees = pd.DataFrame(attendees_data)
+graph.df_to_graph_insert_as_edge(df_attendees, 'company_url', 'company', 'event_url', 'event', 'attends')
+
+# Company contact info dataframe
+contact_info_data = {
+    'company_url': ['techco.com', 'greenergy.com', 'megabank.com', 'aiinnovate.com', 'healthtech.com'],
+    'office_city': ['San Francisco', 'Berlin', 'New York', 'Tokyo', 'London'],
+    'office_country': ['USA', 'Germany', 'USA', 'Japan', 'UK'],
+    'office_address': ['123 Tech St', '456 Green Ave', '789 Finance Blvd', '101 AI Road', '202 Health Lane'],
+    'office_email': ['info@techco.com', 'contact@greenergy.com', 'support@megabank.com', 'hello@aiinnovate.com', 'info@healthtech.com']
+}
+df_contact_info = pd.DataFrame(contact_info_data)
+graph.df_to_graph_insert_at_node(df_contact_info, 'company_url', 'company')
+
+# Company employee info dataframe
+employee_data = {
+    'company_url': ['techco.com'] * 4 + ['greenergy.com'] * 4 + ['megabank.com'] * 4 + ['aiinnovate.com'] * 4 + ['healthtech.com'] * 4,
+    'person_id': range(1, 21),
+    'person_first_name': ['John', 'Emma', 'Michael', 'Sophia', 'Lars', 'Greta', 'Hans', 'Ingrid', 'David', 'Sarah', 'Robert', 'Jennifer', 'Takashi', 'Yuki', 'Hiroshi', 'Aiko', 'James', 'Elizabeth', 'William', 'Olivia'],
+    'person_last_name': ['Smith', 'Johnson', 'Brown', 'Davis', 'Schmidt', 'Muller', 'Weber', 'Fischer', 'Wilson', 'Taylor', 'Anderson', 'Thomas', 'Tanaka', 'Sato', 'Suzuki', 'Watanabe', 'Jones', 'White', 'Harris', 'Martin'],
+    'person_email': [f"{fname.lower()}.{lname.lower()}@{company}" for fname, lname, company in zip(['John', 'Emma', 'Michael', 'Sophia', 'Lars', 'Greta', 'Hans', 'Ingrid', 'David', 'Sarah', 'Robert', 'Jennifer', 'Takashi', 'Yuki', 'Hiroshi', 'Aiko', 'James', 'Elizabeth', 'William', 'Olivia'], 
+                                                                                                  ['Smith', 'Johnson', 'Brown', 'Davis', 'Schmidt', 'Muller', 'Weber', 'Fischer', 'Wilson', 'Taylor', 'Anderson', 'Thomas', 'Tanaka', 'Sato', 'Suzuki', 'Watanabe', 'Jones', 'White', 'Harris', 'Martin'],
+                                                                                                  ['techco.com'] * 4 + ['greenergy.com'] * 4 + ['megabank.com'] * 4 + ['aiinnovate.com'] * 4 + ['healthtech.com'] * 4)],
+    'person_city': ['San Francisco', 'San Jose', 'Oakland', 'Palo Alto', 'Berlin', 'Hamburg', 'Munich', 'Frankfurt', 'New York', 'Boston', 'Chicago', 'Los Angeles', 'Tokyo', 'Osaka', 'Kyoto', 'Yokohama', 'London', 'Manchester', 'Birmingham', 'Liverpool'],
+    'person_country': ['USA'] * 4 + ['Germany'] * 4 + ['USA'] * 4 + ['Japan'] * 4 + ['UK'] * 4,
+    'person_seniority': ['Senior'] * 5 + ['Mid-level'] * 10 + ['Junior'] * 5,
+    'person_department': ['Engineering', 'Marketing', 'Sales', 'HR', 'Operations'] * 4
+}
+df_employees = pd.DataFrame(employee_data)
+graph.df_to_graph_insert_as_edge(df_employees, 'person_id', 'people', 'company_url', 'company', 'works_at')
+
+def display_table(df, title):
+    print(f"\n{title}")
+    print(tabulate(df, headers='keys', tablefmt='pretty', showindex=False))
+
+display_table(df_events, "Events Dataframe")
+display_table(df_companies, "Companies Dataframe")
+display_table(df_attendees, "Event Attendees Dataframe")
+display_table(df_contact_info, "Company Contact Info Dataframe")
+display_table(df_employees, "Company Employee Info Dataframe")
+
+event_set   = {'event1.com', 'event2.com', 'event3.com', 'event4.com', 'event5.com'}
+company_set =  {'techco.com', 'greenergy.com', 'megabank.com', 'aiinnovate.com', 'healthtech.com'}
+people_set  = set(range(1, 21))
+
+full_set = event_set.union(company_set, people_set)
+node_set = full_set
+
+node_conditions = {'event_country':'USA'}
+filtered_nodes_events_in_usa = graph.filter_node_set_global_filterer('event', node_conditions, node_set)
+filtered_nodes_events_in_usa_idfied = {node.node_id for node in filtered_nodes_events_in_usa}  
+
+node_conditions = {'company_name':'TechCo'}
+filtered_nodes_events_in_usa_company_techco = graph.filter_node_set_global_filterer('company', node_conditions, filtered_nodes_events_in_usa_idfied)
+
+print ("----------------------------------------------------------------------------------------------------------")
+print ("----------------------------------------------------------------------------------------------------------")
+
+print("\n(test node filtering) events in USA :\n")
+for node in filtered_nodes_events_in_usa:
+    print(node)
+
+print ("----------------------------------------------------------------------------------------------------------")
+print ("----------------------------------------------------------------------------------------------------------")
+
+
+print("\n(test node filtering) events in USA. company is techco:\n")
+for node in filtered_nodes_events_in_usa_company_techco:
+    print(node)
+
+print ("----------------------------------------------------------------------------------------------------------")
+print ("----------------------------------------------------------------------------------------------------------")
+
+node_conditions = {'company_relation_to_event':'Sponsor'}
+node_set = full_set
+filtered_nodes_sponsor_companies = graph.filter_edge_set_global_filterer('company','event','attends',node_conditions,full_set)
+print ("\n filter companies that are sponsors: \n")
+for node in filtered_nodes_sponsor_companies:
+    print(node)
+
+print ("----------------------------------------------------------------------------------------------------------")
+print ("----------------------------------------------------------------------------------------------------------")
+
+node_conditions = {'person_department':'Engineering'}
+node_set = {node.node_id for node in filtered_nodes_sponsor_companies}
+filtered_nodes_sponsor_companies_engineering_people = graph.filter_edge_set_global_filterer('people','company','works_at',node_conditions,node_set)
+print ("\n filter companies that are sponsors and filter people in engineering: \n")
+for node in filtered_nodes_sponsor_companies_engineering_people:
+    print(node)
+
+print ("----------------------------------------------------------------------------------------------------------")
+print ("----------------------------------------------------------------------------------------------------------")
@@ -0,0 +1,7 @@
+import pathlib
+import sys
+
+# makes graphdb importable when pytest runs from the repository root as well as from problem_1
+PROBLEM_DIR = str(pathlib.Path(__file__).resolve().parent.parent)
+if PROBLEM_DIR not in sys.path:
+    sys.path.insert(0, PROBLEM_DIR)
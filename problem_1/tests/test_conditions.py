@@ -0,0 +1,89 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from graphdb import GraphDB
+
+
+@pytest.fixture
+def graph():
+    graph = GraphDB()
+    df = pd.DataFrame({
+        'company_url': [f"c{i}" for i in range(8)],
+        'company_revenue': [500, np.nan, 300, 100, np.nan, 700, 200, 900],
+    })
+    graph.df_to_graph_insert_at_node(df, 'company_url', 'company')
+    return graph
+
+
+# NaN values are missing values: range conditions on the index, the scan and the compact storage agree
+@pytest.mark.parametrize('condition', [('<=', 400), ('>=', 400), ('between', 150, 600), ('in', [500, 700])])
+def test_range_conditions_with_nan(graph, condition):
+    node_ids = set(graph.nodes)
+    conditions = {'company_revenue': condition}
+    index = {node.node_id for node in graph.filter_by_node_conditions_for_set(node_ids, 'company', conditions)}
+    scan = {node.node_id for node in graph.filter_by_node_conditions_for_set_scan(node_ids, 'company', conditions)}
+    compact = {node.node_id for node in graph.to_compact().filter_by_node_conditions_for_set(node_ids, 'company', conditions)}
+    assert index == scan == compact
+    assert condition != ('<=', 400) or index == {'c2', 'c3', 'c6'}
+
+
+@pytest.fixture
+def event_graph():
+    graph = GraphDB()
+    df = pd.DataFrame({
+        'event_url': [f"e{i}" for i in range(6)],
+        'event_start_date': pd.to_datetime(['2025-08-01', '2024-01-01', '2025-07-01', '2025-03-01', None, '2026-01-05']),
+    })
+    graph.df_to_graph_insert_at_node(df, 'event_url', 'event')
+    return graph
+
+
+# datetime values order with each other: Timestamp, date and np.datetime64 bounds on Timestamp values
+@pytest.mark.parametrize('condition, expected', [
+    (('>=', pd.Timestamp('2025-07-01')), {'e0', 'e2', 'e5'}),
+    (('between', datetime.date(2025, 1, 1), pd.Timestamp('2025-12-31')), {'e0', 'e2', 'e3'}),
+    (('<=', np.datetime64('2025-03-01')), {'e1', 'e3'}),
+    (pd.Timestamp('2025-07-01'), {'e2'}),
+    (('>=', '2025'), set()),
+])
+def test_range_conditions_on_datetimes(event_graph, condition, expected):
+    node_ids = set(event_graph.nodes)
+    conditions = {'event_start_date': condition}
+    index = {node.node_id for node in event_graph.filter_by_node_conditions_for_set(node_ids, 'event', conditions)}
+    scan = {node.node_id for node in event_graph.filter_by_node_conditions_for_set_scan(node_ids, 'event', conditions)}
+    compact = {node.node_id for node in event_graph.to_compact().filter_by_node_conditions_for_set(node_ids, 'event', conditions)}
+    assert index == scan == compact == expected
+
+
+# unhashable values (a list-valued tags column) are loaded without being indexed, conditions on them scan
+# (also on the compact storage and after a snapshot round trip)
+def test_unhashable_attribute_values(tmp_path):
+    graph = GraphDB()
+    df = pd.DataFrame({'event_url': ['e1', 'e2', 'e3'], 'tags': [['ai', 'ml'], 'finance', ['ai', 'ml']]})
+    graph.df_to_graph_insert_at_node(df, 'event_url', 'event')
+    compact_graph = graph.to_compact()
+    graph.save(tmp_path / 'graph.snapshot')
+    loaded_graph = GraphDB.load(tmp_path / 'graph.snapshot')
+    node_ids = set(graph.nodes)
+    for condition in [['ai', 'ml'], 'finance', ('in', [['ai', 'ml'], 'finance'])]:
+        conditions = {'tags': condition}
+        index = {node.node_id for node in graph.filter_by_node_conditions_for_set(node_ids, 'event', conditions)}
+        scan = {node.node_id for node in graph.filter_by_node_conditions_for_set_scan(node_ids, 'event', conditions)}
+        compact = {node.node_id for node in compact_graph.filter_by_node_conditions_for_set(node_ids, 'event', conditions)}
+        loaded = {node.node_id for node in loaded_graph.filter_by_node_conditions_for_set(node_ids, 'event', conditions)}
+        assert index == scan == compact == loaded
+    assert graph.lookup_node_attribute('event', 'tags', 'finance') == {'e2'}
+    assert loaded_graph.nodes['e1'].attributes['tags'] == ['ai', 'ml']
+
+
+# ids not in the graph are ignored by the node filters, the index path and the scan agree
+def test_unknown_node_ids(graph):
+    conditions = {'company_revenue': ('>=', 0)}
+    for node_ids in [{'nope'}, {'nope', 'c0'}]:
+        index = {node.node_id for node in graph.filter_by_node_conditions_for_set(node_ids, 'company', conditions)}
+        scan = {node.node_id for node in graph.filter_by_node_conditions_for_set_scan(node_ids, 'company', conditions)}
+        compact = {node.node_id for node in graph.to_compact().filter_by_node_conditions_for_set(node_ids, 'company', conditions)}
+        assert index == scan == compact == (node_ids & {'c0'})
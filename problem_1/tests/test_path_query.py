@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from graphdb import GraphDB
+from graphdb.path_query import parse_path
+
+
+@pytest.fixture
+def graph():
+    graph = GraphDB()
+    graph.df_to_graph_insert_at_node(pd.DataFrame({
+        'company_url': ['c1', 'c2', 'c3'],
+        'company_revenue': [2000, 150.5, 900],
+        'company_industry': ['Finance', 'Technology', 'Fintech'],
+        'company_zip': ['02139', '10001', '94105'],
+    }), 'company_url', 'company')
+    graph.df_to_graph_insert_at_node(pd.DataFrame({'person_url': ['p1', 'p2', 'p3']}), 'person_url', 'people')
+    graph.df_to_graph_insert_as_edge(pd.DataFrame({'person_url': ['p1', 'p2', 'p3'], 'company_url': ['c1', 'c2', 'c3']}),
+                                     'person_url', 'people', 'company_url', 'company', 'works_at')
+    return graph
+
+
+# unquoted numbers are parsed, quoted values stay strings, the operators map to the conditions of conditions.py
+def test_parse_condition_values():
+    steps, _ = parse_path('company{revenue=2000, a>=1.5, b<=-3, c=1..10, d=x|"y|z"|3, e^=Fin, zip="02139", f="a, b"}')
+    assert steps[0].node_conditions == {
+        'revenue': 2000, 'a': ('>=', 1.5), 'b': ('<=', -3), 'c': ('between', 1, 10),
+        'd': ('in', ['x', 'y|z', 3]), 'e': ('prefix', 'Fin'), 'zip': '02139', 'f': 'a, b',
+    }
+    with pytest.raises(ValueError):
+        parse_path('company{revenue!=2000}')
+
+
+@pytest.mark.parametrize('condition, expected', [
+    ('revenue=2000', {'p1'}),
+    ('revenue>=900', {'p1', 'p3'}),
+    ('revenue=100..1000', {'p2', 'p3'}),
+    ('revenue=150.5|2000', {'p1', 'p2'}),
+    ('industry^=Fin', {'p1', 'p3'}),
+    ('zip="02139"', {'p1'}),
+    ('zip=02139', set()),
+])
+def test_path_conditions(graph, condition, expected):
+    nodes = graph.query_path(f"people -works_at-> company{{{condition}}}")
+    assert {node.node_id for node in nodes} == expected
@@ -0,0 +1,37 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from graphdb import GraphDB
+
+
+@pytest.fixture
+def graph():
+    graph = GraphDB()
+    for person_id in [('p', 1), ('p', 2), 3]:
+        graph.add_node(person_id, 'people')
+    graph.add_node('c1', 'company')
+    for person_id, since in [(('p', 1), '2020-01-01'), (('p', 2), '2023-05-01 10:30'), (3, '2024-02-01')]:
+        graph.add_edge(person_id, 'c1', 'works_at')
+        graph.add_edge_attribute(person_id, 'c1', 'works_at', 'since', pd.Timestamp(since))
+    graph.add_node_attribute('c1', 'founded', datetime.date(1999, 1, 2))
+    return graph
+
+
+# tuple ids, Timestamps and dates come back from a snapshot with the same conditions matching them
+def test_snapshot_round_trip(graph, tmp_path):
+    path = tmp_path / 'graph.snapshot'
+    graph.save(path)
+    loaded = GraphDB.load(path)
+    assert set(loaded.nodes) == set(graph.nodes)
+    conditions = {'since': ('>=', pd.Timestamp('2023-01-01'))}
+    for g in [graph, loaded]:
+        assert {node.node_id for node in g.filter_by_edge_conditions_for_set('people', 'works_at', conditions, {'c1'})} == {('p', 2), 3}
+        assert [node.node_id for node in g.filter_by_node_conditions_for_set({'c1'}, 'company', {'founded': ('<=', datetime.date(2000, 1, 1))})] == ['c1']
+
+
+def test_snapshot_rejects_unsupported_values(graph, tmp_path):
+    graph.add_node_attribute('c1', 'updated', datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc))
+    with pytest.raises(ValueError):
+        graph.save(tmp_path / 'graph.snapshot')
@@ -70,9 +70,26 @@ def generate_people_attributes():
 
     return pd.DataFrame(data, columns=['person_id', 'attribute', 'value'])
 
+# every person works at one company
+def generate_employment():
+    company_urls = [f"company_{i}" for i in range(1, 101)]
+    data = [(f"person_{i}", random.choice(company_urls)) for i in range(1, 101)]
+    return pd.DataFrame(data, columns=['person_id', 'company_url'])
+
+# every company attends 1 to 5 events
+def generate_attendance():
+    event_urls = [f"event_{i}" for i in range(1, 101)]
+    data = []
+    for i in range(1, 101):
+        for event_url in random.sample(event_urls, random.randint(1, 5)):
+            data.append((f"company_{i}", event_url))
+    return pd.DataFrame(data, columns=['company_url', 'event_url'])
+
 # Generate the sample data
 events_df = generate_event_attributes()
 companies_df = generate_company_attributes()
 company_employee_info_df = generate_people_attributes()
+employment_df = generate_employment()
+attendance_df = generate_attendance()
 
 print("Sample data generated successfully.")